@@ -1,12 +1,19 @@
-from typing import Any
+import asyncio
+from functools import cache
+from typing import Any, AsyncIterator, Literal
 from langchain.agents import create_agent
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from autanimos_agent.model import get_model
 from autanimos_agent.prompts import AGENT_SYSTEM_PROMPT, AGENT_SYSTEM_PROMPT_1
 import autanimos_agent.tool as tool_wp
+from autanimos_agent.state import PostAgentState
+from autanimos_agent.events import ProgressEvent, RunFinished, progress_events, progress_stage
 from langfuse import get_client
 from langfuse.langchain import CallbackHandler
-from langchain.messages import HumanMessage
+from langchain.messages import AIMessage, HumanMessage
 from domain.wordpress import PostContext
+from scheduling.ledger import STAGE_GENERATED, STAGE_PUBLISHED, STAGE_TAXONOMY_RESOLVED, get_job_ledger
+import settings
 
 langfuse = get_client()
 
@@ -25,7 +32,13 @@ tools = [
 ]
 
 
+@cache
 def get_agent() -> Any:
+    """Build and compile the agent graph once per process.
+
+    The compiled graph keeps no per-run state (there is no checkpointer), so
+    concurrent ``ainvoke`` calls can share it.
+    """
     model = get_model()
     # TODO: Add content and command for handle tool runtime.
 
@@ -33,17 +46,127 @@ def get_agent() -> Any:
         model=model,
         tools=tools,
         system_prompt=AGENT_SYSTEM_PROMPT_1,
+        state_schema=PostAgentState,
         context_schema=PostContext,
     )
 
 
-async def run_agent(user_prompt: str) -> Any:
-    langfuse_handler = CallbackHandler()
-    agent = get_agent()
-    messages = [HumanMessage(content=user_prompt)]
+async def run_pipeline(
+    context: PostContext, config: dict | None = None, job_id: str | None = None
+) -> dict:
+    """Generate and publish a post without the tool-calling agent.
+
+    One structured LLM call produces the post, which is then published
+    directly. The result has the same shape as the agent's final state.
+
+    With a ``job_id`` every completed stage is recorded in the job ledger and
+    a rerun of the same job resumes after the last completed stage.
+    """
+    ledger = get_job_ledger() if job_id else None
+    job = await asyncio.to_thread(ledger.get_or_create, job_id) if ledger else None
+
+    if job and job.reached(STAGE_PUBLISHED):
+        return {
+            "messages": [
+                HumanMessage(content=context.user_prompt),
+                AIMessage(content=f"Job {job_id} was already published as post {job.post_id}."),
+            ],
+            "generated_post": job.generated_post,
+            "published": True,
+        }
+
+    async with progress_stage("generate", config):
+        if job and job.reached(STAGE_GENERATED):
+            post = job.generated_post
+        else:
+            post = await tool_wp.generate_post(context, config=config)
+            if ledger:
+                await asyncio.to_thread(ledger.record_generated, job_id, post)
 
-    return await agent.ainvoke(
-        {"messages": messages},
-        config={"callbacks": [langfuse_handler]},
-        context=PostContext(user_prompt=user_prompt),
+    async with progress_stage("taxonomy", config):
+        if job and job.reached(STAGE_TAXONOMY_RESOLVED):
+            category_ids, tag_ids = job.category_ids, job.tag_ids
+        else:
+            categories, tags = await tool_wp.client.resolve_taxonomy(post)
+            category_ids = [category.id for category in categories]
+            tag_ids = [tag.id for tag in tags]
+            if ledger:
+                await asyncio.to_thread(ledger.record_taxonomy, job_id, category_ids, tag_ids)
+
+    async with progress_stage("publish", config):
+        created = await tool_wp.client.publish_post(post, category_ids, tag_ids)
+        published = bool(created.id)
+        if ledger and published:
+            await asyncio.to_thread(ledger.record_published, job_id, created.id)
+
+    summary = (
+        f"Post '{post.title}' was published successfully."
+        if published
+        else f"Post '{post.title}' could not be published."
     )
+    return {
+        "messages": [HumanMessage(content=context.user_prompt), AIMessage(content=summary)],
+        "generated_post": post,
+        "published": published,
+    }
+
+
+async def _pipeline_step(inputs: dict, config: RunnableConfig) -> dict:
+    return await run_pipeline(inputs["context"], config=config, job_id=inputs.get("job_id"))
+
+
+@cache
+def get_pipeline() -> RunnableLambda:
+    """The pipeline as a runnable, so it can be streamed like the agent."""
+    return RunnableLambda(_pipeline_step, name="pipeline")
+
+
+@cache
+def get_langfuse_handler() -> CallbackHandler:
+    # The handler tracks observations per run id, so one instance serves every run.
+    return CallbackHandler()
+
+
+async def astream_run(
+    user_prompt: str,
+    mode: Literal["pipeline", "agent"] = settings.AGENT_MODE,
+    job_id: str | None = None,
+) -> AsyncIterator[ProgressEvent]:
+    """Run the pipeline or the agent and yield typed progress events.
+
+    The last event is a RunFinished carrying the same result ``run_agent``
+    returns. ``job_id`` records the run's stages in the job ledger, so a rerun
+    resumes after the last completed one, in both modes.
+    """
+    langfuse_handler = get_langfuse_handler()
+    context = PostContext(user_prompt=user_prompt, job_id=job_id)
+    config = {"callbacks": [langfuse_handler]}
+
+    if mode == "pipeline":
+        raw_events = get_pipeline().astream_events(
+            {"context": context, "job_id": job_id}, config=config, version="v2"
+        )
+    else:
+        agent = get_agent()
+        messages = [HumanMessage(content=user_prompt)]
+        raw_events = agent.astream_events(
+            {"messages": messages},
+            config=config,
+            context=context,
+            version="v2",
+        )
+
+    async for event in progress_events(raw_events):
+        yield event
+
+
+async def run_agent(
+    user_prompt: str,
+    mode: Literal["pipeline", "agent"] = settings.AGENT_MODE,
+    job_id: str | None = None,
+) -> Any:
+    result = None
+    async for event in astream_run(user_prompt, mode, job_id):
+        if isinstance(event, RunFinished):
+            result = event.result
+    return result
@@ -0,0 +1,189 @@
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any, AsyncIterator, Literal
+
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
+
+from metrics import PIPELINE_STAGE_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Emit a TokenProgress event every this many streamed chunks per model call.
+TOKEN_PROGRESS_EVERY = 50
+
+
+class StageStarted(BaseModel):
+    type: Literal["stage_started"] = "stage_started"
+    stage: str
+
+
+class StageFinished(BaseModel):
+    type: Literal["stage_finished"] = "stage_finished"
+    stage: str
+    duration: float
+
+
+class SectionStarted(BaseModel):
+    type: Literal["section_started"] = "section_started"
+    heading: str
+
+
+class SectionFinished(BaseModel):
+    type: Literal["section_finished"] = "section_finished"
+    heading: str
+
+
+class ModelCallStarted(BaseModel):
+    type: Literal["model_call_started"] = "model_call_started"
+    run_id: str
+    name: str
+
+
+class TokenProgress(BaseModel):
+    type: Literal["token_progress"] = "token_progress"
+    run_id: str
+    name: str
+    tokens: int
+
+
+class ModelCallFinished(BaseModel):
+    type: Literal["model_call_finished"] = "model_call_finished"
+    run_id: str
+    name: str
+    duration: float
+    time_to_first_token: float | None = None
+    output_tokens: int
+    tokens_per_second: float | None = None
+
+
+class ToolStarted(BaseModel):
+    type: Literal["tool_started"] = "tool_started"
+    name: str
+
+
+class ToolFinished(BaseModel):
+    type: Literal["tool_finished"] = "tool_finished"
+    name: str
+    duration: float
+
+
+class RunFinished(BaseModel):
+    type: Literal["run_finished"] = "run_finished"
+    duration: float
+    result: Any = None
+
+
+ProgressEvent = (
+    StageStarted | StageFinished | SectionStarted | SectionFinished
+    | ModelCallStarted | TokenProgress | ModelCallFinished
+    | ToolStarted | ToolFinished | RunFinished
+)
+
+_CUSTOM_EVENTS = {
+    "stage_started": StageStarted,
+    "stage_finished": StageFinished,
+    "section_started": SectionStarted,
+    "section_finished": SectionFinished,
+}
+
+
+async def dispatch_progress(name: str, data: dict, config: RunnableConfig | None = None) -> None:
+    """Emit a custom progress event to the surrounding run, if there is one."""
+    try:
+        await adispatch_custom_event(name, data, config=config)
+    except RuntimeError:
+        # Called outside of a runnable (no parent run): nobody is listening.
+        pass
+
+
+@asynccontextmanager
+async def progress_stage(stage: str, config: RunnableConfig | None = None):
+    """Wrap a pipeline stage with ``stage_started``/``stage_finished`` events."""
+    start = time.perf_counter()
+    await dispatch_progress("stage_started", {"stage": stage}, config)
+    try:
+        yield
+    except BaseException:
+        PIPELINE_STAGE_DURATION.observe(time.perf_counter() - start, stage=stage, outcome="error")
+        raise
+    duration = time.perf_counter() - start
+    PIPELINE_STAGE_DURATION.observe(duration, stage=stage, outcome="success")
+    await dispatch_progress("stage_finished", {"stage": stage, "duration": duration}, config)
+
+
+class _ModelCall:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.first_token: float | None = None
+        self.chunks = 0
+
+
+async def progress_events(raw_events: AsyncIterator[dict]) -> AsyncIterator[ProgressEvent]:
+    """Translate ``astream_events(version="v2")`` output into typed progress events.
+
+    Time-to-first-token and tokens/sec are measured per chat model call from
+    the streamed chunks; the output token count comes from the provider's
+    usage metadata when available and falls back to the chunk count.
+    """
+    started = time.perf_counter()
+    calls: dict[str, _ModelCall] = {}
+    tools: dict[str, float] = {}
+
+    async for event in raw_events:
+        kind = event["event"]
+        run_id = str(event.get("run_id"))
+        name = event.get("name", "")
+
+        if kind == "on_chat_model_start":
+            calls[run_id] = _ModelCall(name)
+            yield ModelCallStarted(run_id=run_id, name=name)
+
+        elif kind == "on_chat_model_stream" and run_id in calls:
+            call = calls[run_id]
+            if call.first_token is None:
+                call.first_token = time.perf_counter()
+            call.chunks += 1
+            if call.chunks % TOKEN_PROGRESS_EVERY == 0:
+                yield TokenProgress(run_id=run_id, name=call.name, tokens=call.chunks)
+
+        elif kind == "on_chat_model_end" and run_id in calls:
+            call = calls.pop(run_id)
+            now = time.perf_counter()
+            output = event.get("data", {}).get("output")
+            usage = getattr(output, "usage_metadata", None) or {}
+            output_tokens = usage.get("output_tokens") or call.chunks
+            ttft = call.first_token - call.started if call.first_token else None
+            generating = now - call.first_token if call.first_token else 0.0
+            finished = ModelCallFinished(
+                run_id=run_id,
+                name=call.name,
+                duration=now - call.started,
+                time_to_first_token=ttft,
+                output_tokens=output_tokens,
+                tokens_per_second=output_tokens / generating if generating > 0 else None,
+            )
+            logger.info(
+                f"Model call {call.name}: ttft={ttft if ttft is None else round(ttft, 2)}s "
+                f"tokens={output_tokens} tokens/s={finished.tokens_per_second}"
+            )
+            yield finished
+
+        elif kind == "on_tool_start":
+            tools[run_id] = time.perf_counter()
+            yield ToolStarted(name=name)
+
+        elif kind == "on_tool_end" and run_id in tools:
+            yield ToolFinished(name=name, duration=time.perf_counter() - tools.pop(run_id))
+
+        elif kind == "on_custom_event" and name in _CUSTOM_EVENTS:
+            yield _CUSTOM_EVENTS[name](**event.get("data", {}))
+
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            yield RunFinished(
+                duration=time.perf_counter() - started,
+                result=event.get("data", {}).get("output"),
+            )
@@ -0,0 +1,129 @@
+from functools import cache
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from pydantic import TypeAdapter
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class LLMResponseCache:
+    """Persistent cache of validated LLM results, backed by a local SQLite file.
+
+    Entries are keyed by model, provider, system prompt, user prompt and the
+    JSON schema of the expected output, and store the result re-serialized by
+    that schema. Entries older than ``ttl`` seconds are ignored and purged;
+    above ``max_entries`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str | None,
+        provider: str | None,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Any,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "provider": provider,
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+                "schema": _adapter(schema).json_schema(),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, schema: Any) -> Any | None:
+        """Return the cached result validated against ``schema``, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at >= self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return _adapter(schema).validate_json(value)
+
+    def put(self, key: str, value: Any, schema: Any) -> None:
+        now = time.time()
+        data = _adapter(schema).dump_json(value).decode("utf-8")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_used LIMIT ?
+                    )
+                    """,
+                    (overflow,),
+                )
+                logger.info(f"Evicted {overflow} LLM responses from {self.path}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def get_llm_cache() -> LLMResponseCache | None:
+    if not settings.LLM_CACHE_PATH:
+        return None
+    return LLMResponseCache(
+        settings.LLM_CACHE_PATH,
+        ttl=settings.LLM_CACHE_TTL,
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    )
@@ -1,10 +1,36 @@
 
 
 
+import asyncio
 from functools import cache
+import logging
+import time
+from typing import Any
 from langchain.chat_models import init_chat_model
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+from autanimos_agent.llm_cache import LLMResponseCache, get_llm_cache
+from client.rate_limit import call_with_rate_limit, get_provider_limiter
+from metrics import CACHE_REQUESTS, LLM_CALL_DURATION, LLM_TOKENS
 import settings
 
+logger = logging.getLogger(__name__)
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Count the input/output tokens the provider reports for every model call."""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                for kind in ("input", "output"):
+                    if usage.get(f"{kind}_tokens"):
+                        LLM_TOKENS.inc(usage[f"{kind}_tokens"], model=str(settings.CHAT_MODEL), kind=kind)
+
+
 @cache
 def get_model():
     model = init_chat_model(
@@ -12,5 +38,82 @@ def get_model():
         model_provider=settings.MODEL_PROVIDER,
         api_key=settings.OPENAI_API_KEY,
         base_url=settings.OPENAI_BASE_URL,
+        callbacks=[TokenUsageCallback()],
     )
     return model
+
+
+@cache
+def get_structured_model(schema):
+    """Return ``get_model().with_structured_output(schema)``, built once per schema.
+
+    The runnable holds no per-call state, so it is shared by concurrent calls.
+    """
+    return get_model().with_structured_output(schema)
+
+
+async def _timed_call(schema: Any, call) -> Any:
+    start = time.perf_counter()
+    try:
+        return await call_with_rate_limit(get_provider_limiter("chat"), call)
+    finally:
+        LLM_CALL_DURATION.observe(
+            time.perf_counter() - start, schema=getattr(schema, "__name__", str(schema))
+        )
+
+
+async def _cached_call(schema: Any, prompt: str, call, system_prompt: str, bypass_cache: bool) -> Any:
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return await _timed_call(schema, call)
+
+    key = LLMResponseCache.make_key(
+        settings.CHAT_MODEL, settings.MODEL_PROVIDER, system_prompt, prompt, schema
+    )
+    if not (bypass_cache or settings.LLM_CACHE_BYPASS):
+        cached = await asyncio.to_thread(llm_cache.get, key, schema)
+        if cached is not None:
+            logger.info("LLM response cache hit.")
+            CACHE_REQUESTS.inc(cache="llm", result="hit")
+            return cached
+        CACHE_REQUESTS.inc(cache="llm", result="miss")
+
+    result = await _timed_call(schema, call)
+    if result is not None:
+        await asyncio.to_thread(llm_cache.put, key, result, schema)
+    return result
+
+
+async def ainvoke_structured(
+    schema: Any,
+    prompt: str,
+    config: RunnableConfig | None = None,
+    system_prompt: str = "",
+    bypass_cache: bool = False,
+) -> Any:
+    """Invoke the structured-output model for ``schema``, going through the response cache.
+
+    A cached result is returned without calling the provider unless
+    ``bypass_cache`` (or ``LLM_CACHE_BYPASS``) is set; fresh results are stored.
+    """
+    messages = [("system", system_prompt), ("human", prompt)] if system_prompt else prompt
+
+    async def call():
+        return await get_structured_model(schema).ainvoke(messages, config=config)
+
+    return await _cached_call(schema, prompt, call, system_prompt, bypass_cache)
+
+
+async def ainvoke_text(
+    prompt: str,
+    config: RunnableConfig | None = None,
+    system_prompt: str = "",
+    bypass_cache: bool = False,
+) -> str:
+    """Invoke the chat model for plain text, going through the response cache."""
+    messages = [("system", system_prompt), ("human", prompt)] if system_prompt else prompt
+
+    async def call():
+        return (await get_model().ainvoke(messages, config=config)).text
+
+    return await _cached_call(str, prompt, call, system_prompt, bypass_cache)
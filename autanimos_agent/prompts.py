@@ -96,7 +96,7 @@ Your goal is to create high-quality, SEO-optimized blog posts for a WordPress si
 2. Use the `generate_content` tool to produce the main content and category and tags.
 3. Do not ask the user what topic to write about — use the user's input as the topic directly.
 4. If the user's input is short or unclear, infer a suitable topic and generate content about it.
-5. Use the `create_post` tool to create the post in the WordPress API.
+5. Use the `create_post` tool to create the post in the WordPress API. It takes no arguments: it publishes the post produced by `generate_content`.
 """
 
 
@@ -123,4 +123,41 @@ You are an expert author and your task create a new category based on the input
 
 ## Input Prompt:
 - {input_prompt}
-"""
\ No newline at end of file
+"""
+
+
+OUTLINE_PROMPT = """
+You are an expert WordPress content creator and SEO specialist.
+Plan an SEO-optimized blog post for the request below. Do not write the post yet.
+
+## Your Responsibilities:
+- Write the post title and an english, unique slug.
+- Split the post into sections in reading order, starting with an introduction (empty heading) and ending with a conclusion.
+- For every section give its heading, the key points it must cover and its target length, so that the total meets the requested minimum word count.
+- Choose the categories and tags for the post.
+
+## Request:
+{user_prompt}
+"""
+
+SECTION_PROMPT = """
+You are an expert WordPress content creator and SEO specialist.
+Write one section of the blog post "{title}".
+
+## Post outline:
+{outline}
+
+## Section to write:
+- Heading: {heading}
+- Key points: {key_points}
+- Length: about {target_words} words
+
+## Rules:
+- Return only the HTML body of this section, without its heading.
+- Use HTML tags suitable for SEO and readability (<p>, <h3>, <ul>, <li>, <strong>, <em>); do not use <html>, <body> or <head>.
+- Do not repeat what the other sections of the outline cover.
+- Follow the language and instructions of the original request.
+
+## Original request:
+{user_prompt}
+"""
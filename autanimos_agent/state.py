@@ -0,0 +1,13 @@
+from typing_extensions import NotRequired
+from langchain.agents import AgentState
+from domain.wordpress import GeneratePostData
+
+
+class PostAgentState(AgentState):
+    """Agent state with the post produced by `generate_content`.
+
+    `create_post` reads the post from here, so the model never has to repeat
+    the generated HTML body in its tool-call arguments.
+    """
+
+    generated_post: NotRequired[GeneratePostData]
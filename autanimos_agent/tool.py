@@ -1,11 +1,24 @@
+import asyncio
 from functools import cache
 import logging
 from langchain.chat_models import init_chat_model
 from langchain.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain.tools import tool, ToolRuntime
-from autanimos_agent.model import get_model
-from autanimos_agent.prompts import CREATE_CATEGORY_PROMPT, CREATE_TAG_PROMPT
-from domain.wordpress import CreateWordPressPostData, GeneratePostData, Tag
+from autanimos_agent.model import ainvoke_structured, ainvoke_text
+from autanimos_agent.prompts import (
+    CREATE_CATEGORY_PROMPT,
+    CREATE_TAG_PROMPT,
+    OUTLINE_PROMPT,
+    SECTION_PROMPT,
+)
+from domain.wordpress import (
+    CreateWordPressPostData,
+    GeneratePostData,
+    OutlineSection,
+    PostOutline,
+    Tag,
+)
 from client.wp_client import WordPressClient, get_wp_client
 from domain.wordpress import (
     Category,
@@ -16,6 +29,10 @@ from domain.wordpress import (
     PostContext,
 )
 from langgraph.types import Command
+from autanimos_agent.state import PostAgentState
+from autanimos_agent.events import dispatch_progress
+from scheduling.ledger import STAGE_GENERATED, STAGE_PUBLISHED, STAGE_TAXONOMY_RESOLVED, get_job_ledger
+import settings
 
 client: WordPressClient = get_wp_client()
 
@@ -122,10 +139,8 @@ async def create_tag(input_prompt: str) -> list[TagData] | None:
     logger.info(
         f"Generating tags using input prompt '{input_prompt}' and creating them in WordPress."
     )
-    model = get_model()
-    model_with_structure = model.with_structured_output(list[Tag])
-    generated_tags = await model_with_structure.ainvoke(
-        CREATE_TAG_PROMPT.format(input_prompt=input_prompt)
+    generated_tags = await ainvoke_structured(
+        list[Tag], CREATE_TAG_PROMPT.format(input_prompt=input_prompt)
     )
     create_tags: list[TagData] | None = None
     if generated_tags:
@@ -149,10 +164,8 @@ async def create_category(input_prompt: str) -> CategoryData | None:
         CategoryData | None:
             The created category data object if successful, otherwise None.
     """
-    model = get_model()
-    model_with_structure = model.with_structured_output(Category)
-    generated_category = await model_with_structure.ainvoke(
-        CREATE_CATEGORY_PROMPT.format(input_prompt=input_prompt)
+    generated_category = await ainvoke_structured(
+        Category, CREATE_CATEGORY_PROMPT.format(input_prompt=input_prompt)
     )
     if generated_category:
         category = await client.create_category(generated_category)
@@ -164,6 +177,96 @@ async def create_category(input_prompt: str) -> CategoryData | None:
 
 
 
+async def generate_post(
+    context: PostContext,
+    config: RunnableConfig | None = None,
+    sectioned: bool = settings.SECTIONED_GENERATION,
+    bypass_cache: bool = False,
+) -> GeneratePostData:
+    """
+    Generate the structured WordPress post for a user prompt.
+
+    Args:
+        context (PostContext): The run context holding the user prompt.
+        config (RunnableConfig | None): Optional runnable config (callbacks, tags).
+        sectioned (bool): Generate an outline first and write its sections in parallel.
+        bypass_cache (bool): Always call the provider instead of the response cache.
+    Returns:
+        GeneratePostData: The generated post with category and tags.
+    """
+    if sectioned:
+        return await generate_post_sectioned(context, config=config, bypass_cache=bypass_cache)
+
+    logger.info(f"Generating SEO-optimized content for input: {context.user_prompt}.")
+    return await ainvoke_structured(
+        GeneratePostData, context.user_prompt, config=config, bypass_cache=bypass_cache
+    )
+
+
+async def generate_post_sectioned(
+    context: PostContext,
+    config: RunnableConfig | None = None,
+    concurrency: int = settings.SECTION_CONCURRENCY,
+    bypass_cache: bool = False,
+) -> GeneratePostData:
+    """
+    Generate a long post as an outline plus sections written concurrently.
+
+    Wall time is roughly one outline call plus the slowest section instead of
+    one call that streams the whole body.
+
+    Args:
+        context (PostContext): The run context holding the user prompt.
+        config (RunnableConfig | None): Optional runnable config (callbacks, tags).
+        concurrency (int): The maximum number of sections generated at once.
+        bypass_cache (bool): Always call the provider instead of the response cache.
+    Returns:
+        GeneratePostData: The assembled post with category and tags.
+    """
+    logger.info(f"Generating outline for input: {context.user_prompt}.")
+    outline: PostOutline = await ainvoke_structured(
+        PostOutline,
+        OUTLINE_PROMPT.format(user_prompt=context.user_prompt),
+        config=config,
+        bypass_cache=bypass_cache,
+    )
+    outline_text = "\n".join(
+        f"- {section.heading or 'Introduction'}: {'; '.join(section.key_points)}"
+        for section in outline.sections
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write_section(section: OutlineSection) -> str:
+        heading = section.heading or "Introduction"
+        async with semaphore:
+            logger.info(f"Generating section '{heading}'.")
+            await dispatch_progress("section_started", {"heading": heading}, config)
+            body = await ainvoke_text(
+                SECTION_PROMPT.format(
+                    title=outline.title,
+                    outline=outline_text,
+                    heading=heading,
+                    key_points="; ".join(section.key_points),
+                    target_words=section.target_words,
+                    user_prompt=context.user_prompt,
+                ),
+                config=config,
+                bypass_cache=bypass_cache,
+            )
+            await dispatch_progress("section_finished", {"heading": heading}, config)
+        body = body.strip()
+        return f"<h2>{section.heading}</h2>\n{body}" if section.heading else body
+
+    bodies = await asyncio.gather(*(write_section(section) for section in outline.sections))
+    return GeneratePostData(
+        title=outline.title,
+        content="\n".join(bodies),
+        slug=outline.slug,
+        categories=outline.categories,
+        tags=outline.tags,
+    )
+
+
 @tool(
     "generate_content",
     description="Generate SEO-optimized content with category and tags for a WordPress post using an AI model.",
@@ -177,17 +280,19 @@ async def generate_content(runtime: ToolRuntime[PostContext]) -> Command[Generat
     Returns:
         str: The AI-generated SEO-optimized content.
     """
-    model = get_model()
     # messages = runtime.state["messages"]
     # Access the latest user message
     # human_msg = [m for m in messages if m.__class__.__name__ == "HumanMessage"][-1]
-    model = model.with_structured_output(GeneratePostData)
-    user_prompt = runtime.context.user_prompt
     tool_call_id = runtime.tool_call_id
 
-    logger.info(f"Generating SEO-optimized content for input: {user_prompt}.")
-
-    response = await model.ainvoke(user_prompt)
+    job_id = runtime.context.job_id
+    job = await asyncio.to_thread(get_job_ledger().get_or_create, job_id) if job_id else None
+    if job and job.reached(STAGE_GENERATED):
+        response = job.generated_post
+    else:
+        response = await generate_post(runtime.context)
+        if job_id:
+            await asyncio.to_thread(get_job_ledger().record_generated, job_id, response)
     return Command(
         update={
             "generated_post": response,
@@ -196,16 +301,36 @@ async def generate_content(runtime: ToolRuntime[PostContext]) -> Command[Generat
         
     )
 @tool
-async def create_post( post: GeneratePostData, runtime: ToolRuntime) -> bool:
+async def create_post(runtime: ToolRuntime[PostContext, PostAgentState]) -> bool | str:
     """
-    Create a new post in the WordPress API.
+    Create a new post in the WordPress API from the post produced by `generate_content`.
 
     Args:
-        post (GeneratePostData): The post data object containing title, content, tags, and categories.
-        runtime (ToolRuntime): The runtime of the tool.
+        runtime (ToolRuntime): The runtime of the tool; the post is read from its state.
 
     Returns:
         bool: True if the post was created successfully, False otherwise.
     """
-    result = await client.create_post_with_categories_and_tags(post)
-    return result
\ No newline at end of file
+    post = runtime.state.get("generated_post")
+    if post is None:
+        return "No generated post found. Call `generate_content` first."
+    job_id = runtime.context.job_id
+    if not job_id:
+        return await client.create_post_with_categories_and_tags(post)
+
+    # Scheduled runs record each stage, like ``run_pipeline``, so a rerun never publishes twice.
+    ledger = get_job_ledger()
+    job = await asyncio.to_thread(ledger.get_or_create, job_id)
+    if job.reached(STAGE_PUBLISHED):
+        return True
+    if job.reached(STAGE_TAXONOMY_RESOLVED):
+        category_ids, tag_ids = job.category_ids, job.tag_ids
+    else:
+        categories, tags = await client.resolve_taxonomy(post)
+        category_ids = [category.id for category in categories]
+        tag_ids = [tag.id for tag in tags]
+        await asyncio.to_thread(ledger.record_taxonomy, job_id, category_ids, tag_ids)
+    created = await client.publish_post(post, category_ids, tag_ids)
+    if created.id:
+        await asyncio.to_thread(ledger.record_published, job_id, created.id)
+    return bool(created.id)
\ No newline at end of file
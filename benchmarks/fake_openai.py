@@ -0,0 +1,214 @@
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import time
+import uuid
+from typing import Any
+
+import numpy as np
+from aiohttp import web
+
+WORDS = (
+    "language learning practice speaking listening vocabulary grammar lesson "
+    "daily habit progress method review memory skill conversation exam"
+).split()
+
+
+def fake_embedding(value: Any, dimensions: int) -> np.ndarray:
+    """A deterministic unit vector per input, so equal texts embed identically."""
+    seed = int.from_bytes(hashlib.sha256(repr(value).encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class SchemaFaker:
+    """Build a random instance of a JSON schema, with plausible values for post fields."""
+
+    def __init__(self, term_space: int, content_words: int):
+        self.term_space = term_space
+        self.content_words = content_words
+
+    def words(self, count: int) -> str:
+        return " ".join(random.choice(WORDS) for _ in range(count))
+
+    def _string(self, name: str) -> str:
+        if name == "slug":
+            return f"benchmark-{uuid.uuid4().hex[:12]}"
+        if name == "name":
+            return f"topic {random.randrange(self.term_space)}"
+        if name == "content":
+            return f"<p>{self.words(self.content_words)}</p>"
+        if name == "date":
+            return time.strftime("%Y-%m-%dT%H:%M:%S")
+        return self.words(4)
+
+    def make(self, schema: dict, defs: dict, name: str = "") -> Any:
+        if "$ref" in schema:
+            return self.make(defs[schema["$ref"].split("/")[-1]], defs, name)
+        if "anyOf" in schema:
+            options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+            return self.make(options[0], defs, name) if options else None
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                key: self.make(value, defs, key)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            return [self.make(schema.get("items", {}), defs, name) for _ in range(random.randint(2, 4))]
+        if kind == "integer":
+            return random.randint(100, 400) if name == "target_words" else random.randint(1, 10)
+        if kind == "number":
+            return random.random()
+        if kind == "boolean":
+            return random.random() < 0.5
+        if kind == "null":
+            return None
+        return self._string(name)
+
+
+class FakeOpenAI:
+    """OpenAI-compatible ``/v1/chat/completions`` and ``/v1/embeddings`` endpoints.
+
+    Chat requests with tools are answered with a call to the first tool whose
+    arguments are generated from its JSON schema (the default
+    ``with_structured_output`` method); ``response_format`` requests get
+    JSON content, and plain requests ``completion_words`` words of text.
+    Streaming is supported. ``chat_latency`` is the time to first token,
+    ``embedding_latency`` the time per embedding request.
+    """
+
+    def __init__(
+        self, chat_latency: float = 0.5, embedding_latency: float = 0.05,
+        dimensions: int = 256, completion_words: int = 300, term_space: int = 20,
+        stream_chunk_words: int = 5,
+    ):
+        self.chat_latency = chat_latency
+        self.embedding_latency = embedding_latency
+        self.dimensions = dimensions
+        self.completion_words = completion_words
+        self.stream_chunk_words = stream_chunk_words
+        self.faker = SchemaFaker(term_space, completion_words)
+        self.requests = {"chat": 0, "embeddings": 0}
+
+    def make_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/v1/embeddings", self.embeddings)
+        return app
+
+    def _answer(self, body: dict) -> tuple[str, dict | None]:
+        """Return the message content and, for tool requests, the tool call."""
+        tools = body.get("tools") or []
+        if tools:
+            function = tools[0]["function"]
+            schema = function.get("parameters", {})
+            arguments = self.faker.make(schema, schema.get("$defs", {}))
+            call = {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+            }
+            return "", call
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"]["schema"]
+            return json.dumps(self.faker.make(schema, schema.get("$defs", {}))), None
+        return self.faker.words(self.completion_words), None
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        self.requests["chat"] += 1
+        body = await request.json()
+        content, tool_call = self._answer(body)
+        completion_tokens = max(1, len((content or tool_call["function"]["arguments"]).split()))
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content", "")).split()) for m in body.get("messages", [])),
+            "completion_tokens": completion_tokens,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+        }
+        await asyncio.sleep(self.chat_latency)
+
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": content or None}
+            if tool_call:
+                message["tool_calls"] = [tool_call]
+            return web.json_response({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_call else "stop",
+                }],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(delta: dict, finish_reason: str | None = None, **extra) -> None:
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+
+        text = tool_call["function"]["arguments"] if tool_call else content
+        words = text.split(" ")
+        pieces = [
+            " ".join(words[start:start + self.stream_chunk_words])
+            + (" " if start + self.stream_chunk_words < len(words) else "")
+            for start in range(0, len(words), self.stream_chunk_words)
+        ]
+        await send({"role": "assistant", "content": ""})
+        for index, piece in enumerate(pieces):
+            if tool_call:
+                function = {"arguments": piece}
+                delta_call = {"index": 0, "function": function}
+                if index == 0:
+                    delta_call.update(id=tool_call["id"], type="function")
+                    function["name"] = tool_call["function"]["name"]
+                await send({"tool_calls": [delta_call]})
+            else:
+                await send({"content": piece})
+        await send({}, "tool_calls" if tool_call else "stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunk = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def embeddings(self, request: web.Request) -> web.Response:
+        self.requests["embeddings"] += 1
+        body = await request.json()
+        inputs = body["input"]
+        # A single string or token list is one input; a list of them is a batch.
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        await asyncio.sleep(self.embedding_latency)
+
+        data = []
+        for index, value in enumerate(inputs):
+            vector = fake_embedding(value, self.dimensions)
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        tokens = sum(len(value) if isinstance(value, list) else len(value.split()) for value in inputs)
+        return web.json_response({
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "fake"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
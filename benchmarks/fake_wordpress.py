@@ -0,0 +1,228 @@
+import asyncio
+import base64
+import json
+import math
+import time
+import uuid
+
+from aiohttp import web
+
+MAX_PER_PAGE = 100
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def _error(code: str, status: int, message: str = "", **data) -> web.Response:
+    return web.json_response(
+        {"code": code, "message": message or code, "data": {"status": status, **data}},
+        status=status,
+    )
+
+
+def _project(item: dict, fields: str | None) -> dict:
+    """Apply WordPress' top-level ``_fields`` projection."""
+    if not fields:
+        return item
+    keep = {field.split(".")[0] for field in fields.split(",")}
+    return {key: value for key, value in item.items() if key in keep}
+
+
+class FakeWordPress:
+    """In-memory WordPress REST API covering what ``WordPressClient`` uses.
+
+    Serves JWT login/validation, posts, tags and categories with paging
+    (``X-WP-Total``/``X-WP-TotalPages``), ``include``/``search``/``slug``
+    filters, ``_fields``, ``_embed=wp:term`` and ``term_exists`` errors.
+    Every request waits ``latency`` seconds, and at most ``max_concurrency``
+    requests are served at once, like a PHP-FPM pool.
+    """
+
+    def __init__(
+        self, taxonomy_size: int = 10, latency: float = 0.02, max_concurrency: int = 16,
+        token_ttl: float = 3600,
+    ):
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self._pool = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._next_id = 1
+        self.tokens: set[str] = set()
+        self.posts: dict[int, dict] = {}
+        self.terms: dict[str, dict[int, dict]] = {"category": {}, "post_tag": {}}
+        self.requests = 0
+        for index in range(taxonomy_size):
+            self._add_term("category", f"topic {index}")
+            self._add_term("post_tag", f"topic {index}")
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _add_term(
+        self, taxonomy: str, name: str, slug: str | None = None,
+        description: str | None = None, parent: int | None = None,
+    ) -> dict:
+        term_id = self._new_id()
+        slug = slug or name.lower().replace(" ", "-")
+        term = {
+            "id": term_id,
+            "name": name,
+            "slug": slug,
+            "description": description or "",
+            "count": 0,
+            "link": f"https://example.com/{taxonomy}/{slug}/",
+            "taxonomy": taxonomy,
+        }
+        if taxonomy == "category":
+            term["parent"] = parent or 0
+        self.terms[taxonomy][term_id] = term
+        return term
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/wp-json/jwt-auth/v1/token", self.login)
+        app.router.add_route("*", "/wp-json/jwt-auth/v1/token/validate", self.validate)
+        for path, taxonomy in (("categories", "category"), ("tags", "post_tag")):
+            app.router.add_get(f"/wp-json/wp/v2/{path}", self._list_terms(taxonomy))
+            app.router.add_post(f"/wp-json/wp/v2/{path}", self._create_term(taxonomy))
+            app.router.add_get(f"/wp-json/wp/v2/{path}/{{id}}", self._get_term(taxonomy))
+        app.router.add_get("/wp-json/wp/v2/posts", self.list_posts)
+        app.router.add_post("/wp-json/wp/v2/posts", self.create_post)
+        app.router.add_get("/wp-json/wp/v2/posts/{id}", self.get_post)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests += 1
+        if self._pool is None:
+            await asyncio.sleep(self.latency)
+            return await handler(request)
+        async with self._pool:
+            await asyncio.sleep(self.latency)
+            return await handler(request)
+
+    def _authorized(self, request: web.Request) -> bool:
+        header = request.headers.get("Authorization", "")
+        return header.startswith("Bearer ") and header[7:] in self.tokens
+
+    async def login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not body.get("username") or not body.get("password"):
+            return _error("jwt_auth_failed", 403)
+        payload = {"exp": int(time.time() + self.token_ttl), "jti": uuid.uuid4().hex}
+        token = f"{_b64({'alg': 'HS256', 'typ': 'JWT'})}.{_b64(payload)}.signature"
+        self.tokens.add(token)
+        return web.json_response({
+            "token": token,
+            "user_email": "bench@example.com",
+            "user_nicename": body["username"],
+            "user_display_name": body["username"],
+        })
+
+    async def validate(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return _error("jwt_auth_invalid_token", 403)
+        return web.json_response({"code": "jwt_auth_valid_token", "data": {"status": 200}})
+
+    def _page(self, request: web.Request, items: list[dict]) -> web.Response:
+        query = request.query
+        per_page = min(int(query.get("per_page", 10)), MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        total_pages = max(1, math.ceil(len(items) / per_page))
+        if page > total_pages:
+            return _error("rest_post_invalid_page_number", 400)
+        fields = query.get("_fields")
+        selected = items[(page - 1) * per_page:page * per_page]
+        if "_embed" in query:
+            selected = [self._embedded(post) for post in selected]
+        return web.json_response(
+            [_project(item, fields) for item in selected],
+            headers={"X-WP-Total": str(len(items)), "X-WP-TotalPages": str(total_pages)},
+        )
+
+    def _filter(self, request: web.Request, items: list[dict]) -> list[dict]:
+        query = request.query
+        if "include" in query:
+            ids = {int(value) for value in query["include"].split(",") if value}
+            items = [item for item in items if item["id"] in ids]
+        if "slug" in query:
+            items = [item for item in items if item["slug"] == query["slug"]]
+        if "search" in query:
+            needle = query["search"].lower()
+            items = [
+                item for item in items
+                if needle in (item["name"] if "name" in item else item["title"]["rendered"]).lower()
+            ]
+        return items
+
+    def _list_terms(self, taxonomy: str):
+        async def handler(request: web.Request) -> web.Response:
+            return self._page(request, self._filter(request, list(self.terms[taxonomy].values())))
+        return handler
+
+    def _get_term(self, taxonomy: str):
+        async def handler(request: web.Request) -> web.Response:
+            term = self.terms[taxonomy].get(int(request.match_info["id"]))
+            if term is None:
+                return _error("rest_term_invalid", 404)
+            return web.json_response(_project(term, request.query.get("_fields")))
+        return handler
+
+    def _create_term(self, taxonomy: str):
+        async def handler(request: web.Request) -> web.Response:
+            if not self._authorized(request):
+                return _error("rest_cannot_create", 401)
+            body = await request.json()
+            slug = body.get("slug") or body["name"].lower().replace(" ", "-")
+            for term in self.terms[taxonomy].values():
+                if term["slug"] == slug or term["name"].lower() == body["name"].lower():
+                    return _error("term_exists", 400, term_id=term["id"])
+            term = self._add_term(
+                taxonomy, body["name"], slug, body.get("description"), body.get("parent")
+            )
+            return web.json_response(term, status=201)
+        return handler
+
+    def _embedded(self, post: dict) -> dict:
+        groups = [
+            [self.terms["category"][i] for i in post["categories"] if i in self.terms["category"]],
+            [self.terms["post_tag"][i] for i in post["tags"] if i in self.terms["post_tag"]],
+        ]
+        return {**post, "_embedded": {"wp:term": groups}}
+
+    async def list_posts(self, request: web.Request) -> web.Response:
+        posts = self._filter(request, list(self.posts.values()))
+        for key in ("categories", "tags"):
+            if key in request.query:
+                term_id = int(request.query[key])
+                posts = [post for post in posts if term_id in post[key]]
+        return self._page(request, posts)
+
+    async def get_post(self, request: web.Request) -> web.Response:
+        post = self.posts.get(int(request.match_info["id"]))
+        if post is None:
+            return _error("rest_post_invalid_id", 404)
+        if "_embed" in request.query:
+            post = self._embedded(post)
+        return web.json_response(_project(post, request.query.get("_fields")))
+
+    async def create_post(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return _error("rest_cannot_create", 401)
+        body = await request.json()
+        post_id = self._new_id()
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        post = {
+            "id": post_id,
+            "title": {"rendered": body.get("title", "")},
+            "content": {"rendered": body.get("content", "")},
+            "slug": body.get("slug") or f"post-{post_id}",
+            "date": body.get("date") or now,
+            "modified": now,
+            "status": body.get("status", "publish"),
+            "categories": body.get("categories") or [],
+            "tags": body.get("tags") or [],
+        }
+        self.posts[post_id] = post
+        return web.json_response(_project(post, request.query.get("_fields")), status=201)
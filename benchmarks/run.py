@@ -0,0 +1,323 @@
+"""Offline benchmarks against local fake WordPress and OpenAI-compatible servers.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output new.json --compare results.json
+
+Every scenario reports its call count, errors, wall time, throughput
+(calls/second) and mean/p50/p95/p99 latency in seconds. The application's
+own settings (rate limits, concurrency, ...) are read from the environment
+as usual, so they can be varied between runs.
+"""
+import argparse
+import asyncio
+from datetime import datetime
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from benchmarks.fake_openai import FakeOpenAI
+from benchmarks.fake_wordpress import FakeWordPress
+from benchmarks.servers import ServerThread
+
+logger = logging.getLogger(__name__)
+
+# Settings recorded with each result, since they change what is measured.
+RECORDED_SETTINGS = (
+    "WP_RATE_LIMIT", "WP_RATE_LIMIT_MAX", "WP_POOL_LIMIT_PER_HOST", "WP_PAGE_CONCURRENCY",
+    "PROVIDER_RATE_LIMIT", "PROVIDER_RATE_LIMIT_MAX", "EMBEDDING_BATCH_WINDOW",
+    "EMBEDDING_MAX_BATCH", "SECTIONED_GENERATION",
+    "SECTION_CONCURRENCY", "AGENT_MODE",
+)
+
+
+def summarize(durations: list[float], wall: float, errors: int = 0) -> dict:
+    values = np.array(durations) if durations else np.zeros(1)
+    return {
+        "count": len(durations),
+        "errors": errors,
+        "wall_seconds": wall,
+        "throughput": len(durations) / wall if wall > 0 else 0.0,
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+async def timed_many(
+    call: Callable[[int], Awaitable[object]], count: int, concurrency: int
+) -> dict:
+    """Run ``call(0..count-1)``, at most ``concurrency`` at a time, and summarize the latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: list[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(index)
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Call {index} failed: {e!r}")
+            else:
+                durations.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(count)))
+    return summarize(durations, time.perf_counter() - start, errors)
+
+
+def make_client(wp_url: str, openai_url: str):
+    """A WordPressClient for ``wp_url``, configured from settings like ``get_wp_client``."""
+    from langchain_openai import OpenAIEmbeddings
+
+    from client.rate_limit import get_provider_limiter
+    from client.request_data import BaseRequest
+    from client.tag_category_embedding import EmbeddingHandler
+    from client.wp_client import WordPressClient
+    import settings
+
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        api_key="bench",
+        base_url=openai_url,
+        # Token-length checks need tiktoken's encoding, which is downloaded on first use.
+        check_embedding_ctx_length=False,
+    )
+    embedding_handler = EmbeddingHandler(
+        wp_url, embeddings,
+        rate_limiter=get_provider_limiter("embeddings"),
+        batch_window=settings.EMBEDDING_BATCH_WINDOW,
+        max_batch_size=settings.EMBEDDING_MAX_BATCH,
+    )
+    request_data = BaseRequest(
+        timeout=settings.WP_REQUEST_TIMEOUT,
+        limit_per_host=settings.WP_POOL_LIMIT_PER_HOST,
+        rate_limit=settings.WP_RATE_LIMIT,
+        max_rate_limit=settings.WP_RATE_LIMIT_MAX,
+        max_retries=settings.WP_MAX_RETRIES,
+        retry_base_delay=settings.RETRY_BASE_DELAY,
+        retry_max_delay=settings.RETRY_MAX_DELAY,
+    )
+    return WordPressClient(
+        request_data, wp_url, "bench", "bench", embedding_handler,
+        taxonomy_cache_ttl=settings.WP_TAXONOMY_CACHE_TTL,
+        per_page=settings.WP_PER_PAGE,
+        page_concurrency=settings.WP_PAGE_CONCURRENCY,
+    )
+
+
+def _post(index: int, categories: list[str], tags: list[str]):
+    from domain.wordpress import Category, GeneratePostData, Tag
+
+    return GeneratePostData(
+        title=f"Benchmark post {index}",
+        content="<p>benchmark</p>" * 50,
+        slug=f"benchmark-{uuid.uuid4().hex[:12]}",
+        categories=[Category(name=name, slug=name.replace(" ", "-")) for name in categories],
+        tags=[Tag(name=name, slug=name.replace(" ", "-")) for name in tags],
+    )
+
+
+async def bench_publish(args, wp: FakeWordPress, wp_url: str, openai_url: str) -> dict:
+    client = make_client(wp_url, openai_url)
+    category_ids = list(wp.terms["category"])[:2]
+    tag_ids = list(wp.terms["post_tag"])[:4]
+    posts = [_post(index, [], []) for index in range(args.posts)]
+    try:
+        await client.login_jwt()
+        return await timed_many(
+            lambda index: client.publish_post(posts[index], category_ids, tag_ids),
+            args.posts, args.concurrency,
+        )
+    finally:
+        await client.aclose()
+
+
+async def bench_taxonomy(args, size: int, openai_url: str) -> dict:
+    """Resolve the taxonomy of ``taxonomy_posts`` posts against ``size`` existing terms.
+
+    Each post has existing and new candidates. The first call loads the
+    taxonomy and embeds it, and is reported separately as ``cold_seconds``.
+    """
+    wp = FakeWordPress(taxonomy_size=size, latency=args.wp_latency, max_concurrency=args.wp_workers)
+    server = ServerThread(wp.make_app()).start()
+    client = make_client(server.url, openai_url)
+
+    def names(existing: int, new: int) -> list[str]:
+        return [f"topic {random.randrange(size)}" for _ in range(existing)] + [
+            f"new topic {uuid.uuid4().hex[:8]}" for _ in range(new)
+        ]
+
+    posts = [_post(index, names(2, 1), names(4, 2)) for index in range(args.taxonomy_posts)]
+    try:
+        start = time.perf_counter()
+        await client.resolve_taxonomy(posts[0])
+        cold = time.perf_counter() - start
+        warm = await timed_many(
+            lambda index: client.resolve_taxonomy(posts[index + 1]),
+            len(posts) - 1, args.concurrency,
+        )
+        return {"terms": size, "cold_seconds": cold, **warm}
+    finally:
+        await client.aclose()
+        server.stop()
+
+
+async def bench_scheduler(args) -> dict:
+    """Run ``rows`` planner rows through the scheduler's in-process task runner."""
+    import autanimos_agent.tool as tool_wp
+    from scheduling.tasks import run_tasks
+
+    tool_wp.client.embedding_handler.embeddings.check_embedding_ctx_length = False
+    run_id = uuid.uuid4().hex[:8]
+    rows = [
+        {
+            "title": f"Benchmark row {run_id} {index}",
+            "keywords": "benchmark",
+            "goal": "awareness",
+            "short explanation": "A post generated by the benchmark harness.",
+            "date": datetime.now().date().isoformat(),
+        }
+        for index in range(args.rows)
+    ]
+    start = time.perf_counter()
+    results = await run_tasks(rows, concurrency=args.concurrency)
+    wall = time.perf_counter() - start
+    durations = [result.duration for result in results if result.status == "success"]
+    return summarize(durations, wall, errors=len(results) - len(durations))
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Print p50/p95/throughput of every scenario next to the baseline's."""
+    print(f"{'scenario':<22}{'metric':<12}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50", "p95", "throughput"):
+            old, new = previous.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:<22}{metric:<12}{old:>12.4f}{new:>12.4f}{change:>10}")
+
+
+async def run(args, wp: FakeWordPress, wp_url: str, openai_url: str) -> dict:
+    scenarios = {}
+    selected = args.scenarios.split(",")
+    if "publish" in selected:
+        logger.info("Running publish benchmark")
+        scenarios["publish"] = await bench_publish(args, wp, wp_url, openai_url)
+    if "taxonomy" in selected:
+        for size in (int(size) for size in args.taxonomy_sizes.split(",")):
+            logger.info(f"Running taxonomy benchmark with {size} terms")
+            scenarios[f"taxonomy_{size}"] = await bench_taxonomy(args, size, openai_url)
+    if "scheduler" in selected:
+        logger.info(f"Running scheduler benchmark with {args.rows} rows")
+        scenarios["scheduler_batch"] = await bench_scheduler(args)
+    return scenarios
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="a previous result file to compare against")
+    parser.add_argument("--scenarios", default="publish,taxonomy,scheduler")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--posts", type=int, default=50, help="posts in the publish scenario")
+    parser.add_argument("--taxonomy-sizes", default="10,1000,50000")
+    parser.add_argument("--taxonomy-posts", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=10, help="rows in the scheduler scenario")
+    parser.add_argument("--scheduler-taxonomy-size", type=int, default=100)
+    parser.add_argument("--wp-latency", type=float, default=0.02)
+    parser.add_argument("--wp-workers", type=int, default=16, help="concurrent requests the fake WordPress serves")
+    parser.add_argument("--chat-latency", type=float, default=0.5)
+    parser.add_argument("--embedding-latency", type=float, default=0.05)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--completion-words", type=int, default=300)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    fake_openai = FakeOpenAI(
+        chat_latency=args.chat_latency,
+        embedding_latency=args.embedding_latency,
+        dimensions=args.dimensions,
+        completion_words=args.completion_words,
+        term_space=args.scheduler_taxonomy_size * 2,
+    )
+    wp = FakeWordPress(
+        taxonomy_size=args.scheduler_taxonomy_size,
+        latency=args.wp_latency,
+        max_concurrency=args.wp_workers,
+    )
+    openai_server = ServerThread(fake_openai.make_app()).start()
+    wp_server = ServerThread(wp.make_app()).start()
+    workdir = tempfile.mkdtemp(prefix="benchmark-")
+
+    # Settings are read at import time, so point them at the fakes before importing the app.
+    os.environ.update({
+        "WP_BASE_URL": wp_server.url,
+        "WP_USERNAME": "bench",
+        "WP_PASSWORD": "bench",
+        "OPENAI_BASE_URL": openai_server.url + "/v1",
+        "OPENAI_API_KEY": "bench",
+        "CHAT_MODEL": "fake-chat",
+        "MODEL_PROVIDER": "openai",
+        "EMBEDDING_CACHE_PATH": "",
+        "LLM_CACHE_PATH": "",
+        "JOB_LEDGER_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "AGENT_MODE": "pipeline",
+        "LANGFUSE_TRACING_ENABLED": "false",
+    })
+    import settings
+
+    try:
+        scenarios = asyncio.run(run(args, wp, wp_server.url, openai_server.url + "/v1"))
+    finally:
+        wp_server.stop()
+        openai_server.stop()
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "args": vars(args),
+            "settings": {name: getattr(settings, name) for name in RECORDED_SETTINGS},
+            "fake_requests": {"wordpress": wp.requests, **fake_openai.requests},
+        },
+        "scenarios": scenarios,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(json.dumps(scenarios, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
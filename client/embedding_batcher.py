@@ -0,0 +1,92 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from metrics import EMBEDDING_BATCH_SIZE
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into shared provider calls.
+
+    Texts requested within ``window`` seconds of the first pending one are
+    deduplicated and sent together in one call to ``embed``; a batch is sent
+    early once it holds ``max_batch`` distinct texts. Every caller gets the
+    vectors of its own texts back, in order, and a failed call fails all of
+    its callers.
+
+    Pending texts belong to the running event loop; a batcher used from a
+    new loop starts over.
+    """
+
+    def __init__(
+        self, embed: Callable[[list[str]], Awaitable[list[list[float]]]],
+        window: float = 0.01, max_batch: int = 1000,
+    ):
+        self.embed = embed
+        self.window = window
+        self.max_batch = max_batch
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = {}
+            self._timer = None
+
+        futures = []
+        for text in texts:
+            future = self._pending.get(text)
+            if future is None:
+                future = self._pending[text] = loop.create_future()
+                if len(self._pending) >= self.max_batch:
+                    self._flush()
+                elif self._timer is None:
+                    self._timer = loop.call_later(self.window, self._flush)
+            futures.append(future)
+
+        # Unlike gather, wait does not cancel the shared futures if this caller is cancelled.
+        if futures:
+            await asyncio.wait(set(futures))
+        # Read every exception, so failures of texts not raised here are not reported as lost.
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = self._loop.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: dict[str, asyncio.Future]) -> None:
+        EMBEDDING_BATCH_SIZE.observe(len(batch))
+        try:
+            vectors = await self.embed(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            _fail(batch, e)
+            return
+        if len(vectors) != len(batch):
+            _fail(batch, ValueError(f"Expected {len(batch)} embeddings, the provider returned {len(vectors)}"))
+            return
+        for future, vector in zip(batch.values(), vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+def _fail(batch: dict[str, asyncio.Future], error: Exception) -> None:
+    for future in batch.values():
+        if not future.done():
+            future.set_exception(error)
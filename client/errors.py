@@ -0,0 +1,77 @@
+from email.utils import parsedate_to_datetime
+import time
+from typing import Any, Mapping
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HTTPStatusError(Exception):
+    """A non-2xx response. ``body`` is the decoded JSON, or the raw text if it was not JSON."""
+
+    def __init__(self, status: int, url: str, body: Any = None, headers: Mapping[str, str] | None = None):
+        self.status = status
+        self.url = url
+        self.body = body
+        self.headers = headers or {}
+        super().__init__(f"HTTP {status} from {url}: {self.code or str(body)[:200]}")
+
+    @property
+    def code(self) -> str | None:
+        """The WordPress REST error code, e.g. ``term_exists``."""
+        if isinstance(self.body, dict):
+            return self.body.get("code")
+        return None
+
+    @property
+    def retry_after(self) -> float | None:
+        return parse_retry_after(self.headers.get("Retry-After"))
+
+
+class ClientError(HTTPStatusError):
+    """A 4xx response."""
+
+
+class AuthError(ClientError):
+    """A 401 or 403 response."""
+
+
+class NotFoundError(ClientError):
+    """A 404 response."""
+
+
+class RateLimitError(ClientError):
+    """A 429 response."""
+
+
+class ServerError(HTTPStatusError):
+    """A 5xx response."""
+
+
+def error_for_status(
+    status: int, url: str, body: Any = None, headers: Mapping[str, str] | None = None
+) -> HTTPStatusError:
+    if status in (401, 403):
+        cls = AuthError
+    elif status == 404:
+        cls = NotFoundError
+    elif status == 429:
+        cls = RateLimitError
+    elif 400 <= status < 500:
+        cls = ClientError
+    elif status >= 500:
+        cls = ServerError
+    else:
+        cls = HTTPStatusError
+    return cls(status, url, body, headers)
@@ -0,0 +1,127 @@
+import asyncio
+from functools import cache
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from client.errors import parse_retry_after
+from metrics import RETRIES
+import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses that mean "slow down" rather than "this request is wrong".
+THROTTLE_STATUSES = (429, 503)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate adapts to the backend (additive increase, multiplicative decrease).
+
+    Every successful call raises the rate by ``increase`` requests/second up
+    to ``max_rate``; a throttling response halves it (down to ``min_rate``)
+    and, with a ``Retry-After``, pauses all callers until it has passed. So
+    the limiter probes up to the highest rate the backend sustains.
+
+    Tokens are reserved synchronously, so the limiter needs no lock and is
+    not bound to an event loop.
+    """
+
+    def __init__(
+        self, rate: float, max_rate: float | None = None, min_rate: float = 0.1,
+        burst: float | None = None, increase: float = 0.1, name: str = "",
+    ):
+        self.name = name
+        self.rate = rate
+        self.max_rate = max(rate, max_rate or rate)
+        self.min_rate = min(rate, min_rate)
+        self.burst = burst or max(1.0, rate)
+        self.increase = increase
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        self._tokens -= 1
+        # A negative balance is debt that queued callers pay off in turn.
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._blocked_until - now)
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttled(self, retry_after: float | None = None) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Throttled by {self.name or 'backend'}, rate lowered to {self.rate:.2f}/s")
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for retry number ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _provider_status(error: Exception) -> int | None:
+    # openai/httpx errors carry ``status_code``, google-api-core errors ``code``.
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def _provider_retry_after(error: Exception) -> float | None:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return parse_retry_after(headers.get("retry-after"))
+
+
+async def call_with_rate_limit(
+    limiter: AdaptiveRateLimiter,
+    call: Callable[[], Awaitable[T]],
+    max_retries: int = settings.PROVIDER_MAX_RETRIES,
+    base_delay: float = settings.RETRY_BASE_DELAY,
+    max_delay: float = settings.RETRY_MAX_DELAY,
+) -> T:
+    """Run a side-effect-free provider call under ``limiter``, retrying throttled and 5xx failures."""
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        try:
+            result = await call()
+        except Exception as e:
+            status = _provider_status(e)
+            if status not in RETRY_STATUSES:
+                raise
+            retry_after = _provider_retry_after(e)
+            waitable = (retry_after or 0) <= max_delay
+            if status in THROTTLE_STATUSES:
+                limiter.on_throttled(retry_after if waitable else None)
+            if not waitable or attempt >= max_retries:
+                raise
+            delay = max(retry_after or 0, backoff_delay(attempt, base_delay, max_delay))
+            logger.info(f"Provider returned {status}, retrying in {delay:.1f}s")
+            RETRIES.inc(target=limiter.name, reason=str(status))
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+        limiter.on_success()
+        return result
+
+
+@cache
+def get_provider_limiter(name: str) -> AdaptiveRateLimiter:
+    """The shared limiter of one model-provider endpoint, e.g. "chat" or "embeddings"."""
+    return AdaptiveRateLimiter(
+        settings.PROVIDER_RATE_LIMIT, settings.PROVIDER_RATE_LIMIT_MAX, name=name
+    )
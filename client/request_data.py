@@ -1,43 +1,280 @@
 import asyncio
+import contextlib
+import hashlib
+import json
+import re
+import socket
+import time
+from typing import Any, Mapping
+from urllib.parse import urlsplit
 import aiohttp
 import logging
 
+from client.errors import error_for_status
+from client.rate_limit import (
+    RETRY_STATUSES,
+    THROTTLE_STATUSES,
+    AdaptiveRateLimiter,
+    backoff_delay,
+)
+from metrics import COALESCED_REQUESTS, HTTP_REQUEST_DURATION, RETRIES
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class BaseRequest():
 
-    def __init__(self, timeout: int = 10):
+    def __init__(
+        self,
+        timeout: int = 10,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30,
+        rate_limit: float = 10,
+        max_rate_limit: float = 50,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 30,
+    ):
         self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.rate_limit = rate_limit
+        self.max_rate_limit = max_rate_limit
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._limiters: dict[str, AdaptiveRateLimiter] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        # Identical GETs in flight, shared by their concurrent callers.
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._inflight_loop: asyncio.AbstractEventLoop | None = None
 
-    async def aget(self, url: str, params: dict | None = None, headers: dict | None = None) -> dict:
-        """Send an asynchronous GET request."""
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False)) as session:
-            async with session.get(url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
-                try:
-                    return await response.json()
-                except aiohttp.ClientResponseError as e:
-                    logger.error(f"Error: {e.status} - {e.message}")
-                    raise
-                except Exception as e:
-                    logger.error(f"Error: {e}")
-                    raise
+    async def __aenter__(self) -> "BaseRequest":
+        await self._get_session()
+        return self
 
-    async def apost(self, url: str, data: dict | None = None, headers: dict | None = None) -> dict:
-        """Send an asynchronous POST request."""
-        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False)) as session:
-            async with session.post(url, json=data, headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
-                try:
-                    return await response.json()
-                except aiohttp.ClientResponseError as e:
-                    logger.error(f"Error: {e.status} - {e.message}")
-                    raise
-                except Exception as e:
-                    logger.error(f"Error: {e}")
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use.
+
+        A session is bound to the event loop it was created in, so a new one is
+        opened when the client is reused from a different loop (e.g. successive
+        ``asyncio.run`` calls).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            stale, stale_loop = self._session, self._session_loop
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_loop = loop
+            await _close_session(stale, stale_loop)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared session and release pooled connections."""
+        session, loop = self._session, self._session_loop
+        self._session, self._session_loop = None, None
+        await _close_session(session, loop)
+
+    def _limiter(self, url: str) -> AdaptiveRateLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = AdaptiveRateLimiter(
+                self.rate_limit, self.max_rate_limit, name=host
+            )
+        return self._limiters[host]
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        data: dict | None = None,
+        headers: dict | None = None,
+        retry: bool = False,
+    ) -> tuple[Any, Mapping[str, str]]:
+        """Send a request under the host's rate limit and return the decoded body with the headers.
+
+        Non-2xx responses raise an ``HTTPStatusError`` subclass. 429s are
+        always retried (the server did not process the request); 5xx responses
+        and connection errors only when ``retry`` is set, i.e. for idempotent
+        requests. Retries use jittered exponential backoff, or ``Retry-After``
+        when the server sends one.
+        """
+        limiter = self._limiter(url)
+        endpoint = _endpoint_template(url)
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            session = await self._get_session()
+            start = time.perf_counter()
+            status = "error"
+            try:
+                async with session.request(
+                    method, url, params=params, json=data, headers=headers
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+                    if 200 <= response.status < 300:
+                        limiter.on_success()
+                        return (json.loads(text) if text else None), response.headers
+                    error = error_for_status(response.status, url, _decode(text), response.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not retry or attempt >= self.max_retries:
+                    logger.error(f"Error: {method} {url} failed: {e!r}")
                     raise
+                delay = backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+                logger.info(f"{method} {url} failed ({e!r}), retrying in {delay:.1f}s")
+                RETRIES.inc(target=limiter.name, reason=type(e).__name__)
+            except ValueError as e:
+                logger.error(f"Error: invalid JSON from {method} {url}: {e}")
+                raise
+            else:
+                retry_after = error.retry_after
+                waitable = (retry_after or 0) <= self.retry_max_delay
+                if error.status in THROTTLE_STATUSES:
+                    limiter.on_throttled(retry_after if waitable else None)
+                retriable = error.status == 429 or (retry and error.status in RETRY_STATUSES)
+                if not retriable or not waitable or attempt >= self.max_retries:
+                    logger.error(f"Error: {error}")
+                    raise error
+                delay = max(
+                    retry_after or 0,
+                    backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay),
+                )
+                logger.info(f"{method} {url} returned {error.status}, retrying in {delay:.1f}s")
+                RETRIES.inc(target=limiter.name, reason=str(error.status))
+            finally:
+                HTTP_REQUEST_DURATION.observe(
+                    time.perf_counter() - start, method=method, endpoint=endpoint, status=status
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _shared_task(self, key: tuple, make_request) -> tuple[asyncio.Task, bool]:
+        """Return the in-flight task for ``key``, starting it if needed, and whether it was joined."""
+        loop = asyncio.get_running_loop()
+        if self._inflight_loop is not loop:
+            self._inflight, self._inflight_loop = {}, loop
+        task = self._inflight.get(key)
+        if task is not None:
+            return task, True
+
+        def done(task: asyncio.Task) -> None:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+            # Mark the error as retrieved, in case every caller was cancelled.
+            if not task.cancelled():
+                task.exception()
+
+        self._inflight[key] = task = loop.create_task(make_request())
+        task.add_done_callback(done)
+        return task, False
+
+    async def aget(
+        self, url: str, params: dict | None = None, headers: dict | None = None,
+        retry: bool = True, coalesce: bool = True,
+    ) -> Any:
+        """Send an asynchronous GET request, retried on transient failures."""
+        body, _ = await self.aget_with_headers(
+            url, params=params, headers=headers, retry=retry, coalesce=coalesce
+        )
+        return body
+
+    async def aget_with_headers(
+        self, url: str, params: dict | None = None, headers: dict | None = None,
+        retry: bool = True, coalesce: bool = True,
+    ) -> tuple[Any, Mapping[str, str]]:
+        """Send an asynchronous GET request and return the body with the response headers.
+
+        With ``coalesce``, concurrent GETs of the same URL, params and
+        credentials share one request: every caller gets the same decoded
+        body (treat it as read-only) or the same error.
+        """
+        if not coalesce:
+            return await self._request("GET", url, params=params, headers=headers, retry=retry)
+        key = _request_key("GET", url, params, headers, retry)
+        task, joined = self._shared_task(
+            key, lambda: self._request("GET", url, params=params, headers=headers, retry=retry)
+        )
+        if joined:
+            COALESCED_REQUESTS.inc(method="GET", endpoint=_endpoint_template(url))
+        # A cancelled caller must not cancel the request the others wait for.
+        return await asyncio.shield(task)
+
+    async def apost(
+        self, url: str, data: dict | None = None, headers: dict | None = None,
+        retry: bool = False, params: dict | None = None,
+    ) -> Any:
+        """Send an asynchronous POST request.
+
+        Only 429s are retried unless ``retry`` marks the request as safe to repeat.
+        """
+        body, _ = await self._request(
+            "POST", url, params=params, data=data, headers=headers, retry=retry
+        )
+        return body
+
+
+async def _close_session(
+    session: aiohttp.ClientSession | None, loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Close ``session``, also when it belongs to another event loop."""
+    if session is None or session.closed:
+        return
+    if loop is asyncio.get_running_loop():
+        await session.close()
+        return
+    if not loop.is_closed():
+        # Transports can only be closed by their own loop.
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # aiohttp cannot close transports whose loop is gone: shut the pooled
+    # sockets down directly, then let the session drop them.
+    for connections in session.connector._conns.values():
+        for protocol, _ in connections:
+            sock = protocol.transport and protocol.transport.get_extra_info("socket")
+            if sock is not None:
+                with contextlib.suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+    await session.close()
+
+
+def _endpoint_template(url: str) -> str:
+    """``/wp-json/wp/v2/posts/123`` -> ``/wp-json/wp/v2/posts/{id}``, to keep label values bounded."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", urlsplit(url).path) or "/"
+
+
+def _request_key(
+    method: str, url: str, params: dict | None, headers: dict | None, retry: bool
+) -> tuple:
+    """Identify a request by method, URL, params and a digest of its headers (the auth scope)."""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    scope = hashlib.sha256(
+        json.dumps(sorted((headers or {}).items()), default=str).encode("utf-8")
+    ).hexdigest()
+    return method, url, tuple(items), scope, retry
 
 
+def _decode(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
 
 
 # if __name__ == "__main__":
-#     asyncio.run(get_jwt_token("admin", "F@temeh110"))
\ No newline at end of file
+#     asyncio.run(get_jwt_token("admin", "F@temeh110"))
@@ -1,111 +1,212 @@
 
+import asyncio
+import time
+from typing import TypeVar
 from langchain_openai import OpenAIEmbeddings
-import numpy as np
-from numpy.linalg import norm
+from client.embedding_batcher import EmbeddingBatcher
+from client.embedding_cache import EmbeddingCache, normalize_text
+from client.rate_limit import AdaptiveRateLimiter, call_with_rate_limit
+from client.taxonomy_index import TaxonomyIndex
 from domain.wordpress import CategoryData, TagData
+from metrics import CACHE_REQUESTS, EMBEDDING_BATCH_DURATION
+
+T = TypeVar("T", TagData, CategoryData)
 
 class EmbeddingHandler:
-    def __init__(self, base_url: str, embeddings: OpenAIEmbeddings):
+    def __init__(
+        self, base_url: str, embeddings: OpenAIEmbeddings,
+        cache: EmbeddingCache | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        batch_window: float = 0, max_batch_size: int = 1000,
+    ):
         self.base_url = base_url
         self.embeddings = embeddings
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        # With a window, concurrent callers share provider calls.
+        self.batcher = (
+            EmbeddingBatcher(self._embed_batch, batch_window, max_batch_size)
+            if batch_window > 0
+            else None
+        )
+        self._indexes: dict[str, TaxonomyIndex] = {}
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.embeddings, "model", type(self.embeddings).__name__)
+
+    async def _embed(self, texts: list[str]) -> list[list[float]]:
+        if self.batcher is None:
+            return await self._embed_batch(texts)
+        return await self.batcher.get_embeddings(texts)
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        start = time.perf_counter()
+        try:
+            if self.rate_limiter is None:
+                return await self.embeddings.aembed_documents(texts)
+            return await call_with_rate_limit(
+                self.rate_limiter, lambda: self.embeddings.aembed_documents(texts)
+            )
+        finally:
+            EMBEDDING_BATCH_DURATION.observe(time.perf_counter() - start)
 
     async def get_embeddings(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for a batch of texts using LangChain."""
-        # LangChain's embedding interface supports batch input
-        return await self.embeddings.aembed_documents(texts)
+        """Generate embeddings for a batch of texts using LangChain.
 
-    async def check_category_exists_vector(
+        With a cache configured only the texts that were never embedded before
+        are sent to the provider; the rest are read from disk.
+        """
+        if self.cache is None:
+            # LangChain's embedding interface supports batch input
+            return await self._embed(texts)
+
+        normalized = [normalize_text(text) for text in texts]
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in normalized]
+        vectors = await asyncio.to_thread(self.cache.get_many, keys)
+
+        misses = list(dict.fromkeys(
+            (key, text) for key, text in zip(keys, normalized) if key not in vectors
+        ))
+        CACHE_REQUESTS.inc(len(keys) - len(misses), cache="embedding", result="hit")
+        CACHE_REQUESTS.inc(len(misses), cache="embedding", result="miss")
+        if misses:
+            embedded = await self._embed([text for _, text in misses])
+            new_vectors = {key: vector for (key, _), vector in zip(misses, embedded)}
+            await asyncio.to_thread(self.cache.put_many, new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def get_index(self, taxonomy: str) -> TaxonomyIndex:
+        """Return the similarity index kept for ``taxonomy`` ("tag", "category")."""
+        if taxonomy not in self._indexes:
+            self._indexes[taxonomy] = TaxonomyIndex()
+        return self._indexes[taxonomy]
+
+    async def find_similar(
         self,
-        new_category: str,
-        categories: list[CategoryData] | None = None,
-        threshold: float = 0.6
-    ) -> CategoryData | None:
+        taxonomy: str,
+        name: str,
+        terms: list[T],
+        top_k: int = 1,
+    ) -> list[tuple[T, float]]:
         """
-        Check if a semantically similar category exists using LangChain embeddings.
+        Rank existing terms of a taxonomy by cosine similarity to ``name``.
+
+        Only terms that are not indexed yet are embedded, in the same request
+        as ``name``.
 
         Args:
-            new_category (str): The category name to check.
-            categories (list[CategoryData]): The list of existing categories.
-            threshold (float): Cosine similarity threshold (0–1). Default 0.6.
+            taxonomy (str): The taxonomy key, e.g. "tag" or "category".
+            name (str): The term name to look up.
+            terms (list[T]): The current list of existing terms.
+            top_k (int): How many matches to return.
 
         Returns:
-            CategoryData | None: The existing category if semantically similar,
-                          otherwise None.
+            list[tuple[T, float]]: The best matches with their similarity, best first.
         """
-        if not categories:
-            return None
-
-        # Prepare list of texts: new category first + all existing names
-        names = [new_category] + [c.name for c in categories]
-
-        # Get all embeddings in one async call
-        embeddings = await self.get_embeddings(names)
+        index = self.get_index(taxonomy)
+        index.retain(terms)
+        missing = index.missing(terms)
 
-        new_vector = np.array(embeddings[0])
-        existing_vectors = [np.array(v) for v in embeddings[1:]]
+        embeddings = await self.get_embeddings([name] + [t.name for t in missing])
+        index.upsert(missing, embeddings[1:])
+        return index.top_k(embeddings[0], top_k)
 
-        # Compute cosine similarities
-        similarities = [
-            np.dot(new_vector, ev) / (norm(new_vector) * norm(ev))
-            for ev in existing_vectors
-        ]
-
-        # Find best match
-        best_idx = int(np.argmax(similarities))
-        best_similarity = similarities[best_idx]
+    async def match_many(
+        self,
+        queries: dict[str, tuple[list[str], list[T]]],
+        threshold: float = 0.6,
+    ) -> dict[str, list[T | None]]:
+        """
+        Match many candidate names across taxonomies with a single embedding call.
 
-        if best_similarity >= threshold:
-            best_match = categories[best_idx]
-            print(f"Found similar category: {best_match.name} (similarity={best_similarity:.2f})")
-            return best_match
+        All candidate names and every not-yet-indexed existing term are embedded
+        together; each taxonomy is then scored with one matrix product.
 
-        print(f"No similar category found (max similarity={best_similarity:.2f})")
-        return None
+        Args:
+            queries (dict): Maps a taxonomy key to ``(candidate names, existing terms)``.
+            threshold (float): Cosine similarity threshold (0–1). Default 0.6.
 
-    async def check_tag_exists_vector(
+        Returns:
+            dict[str, list[T | None]]: Per taxonomy, the matched term for each
+                candidate name (in order), or None when nothing is similar enough.
+        """
+        plan = []
+        texts: list[str] = []
+        for taxonomy, (names, terms) in queries.items():
+            index = self.get_index(taxonomy)
+            index.retain(terms)
+            missing = index.missing(terms)
+            plan.append((taxonomy, index, names, missing))
+            texts.extend(names)
+            texts.extend(t.name for t in missing)
+
+        embeddings = await self.get_embeddings(texts) if texts else []
+
+        results: dict[str, list[T | None]] = {}
+        offset = 0
+        for taxonomy, index, names, missing in plan:
+            name_vectors = embeddings[offset:offset + len(names)]
+            offset += len(names)
+            index.upsert(missing, embeddings[offset:offset + len(missing)])
+            offset += len(missing)
+
+            matches: list[T | None] = []
+            for name, best in zip(names, index.best_matches(name_vectors)):
+                if best is not None and best[1] >= threshold:
+                    print(f"Found similar {taxonomy}: {best[0].name} for {name} (similarity={best[1]:.2f})")
+                    matches.append(best[0])
+                else:
+                    matches.append(None)
+            results[taxonomy] = matches
+        return results
+
+    async def match_term(
         self,
-        new_tag: str,
-        tags: list[TagData] | None = None,
-        threshold: float = 0.6
-    ) -> TagData | None:
+        taxonomy: str,
+        name: str,
+        terms: list[T] | None = None,
+        threshold: float = 0.6,
+    ) -> T | None:
         """
-        Check if a semantically similar tag exists using LangChain embeddings.
+        Check if a semantically similar term exists using LangChain embeddings.
 
         Args:
-            new_tag (str): The tag name to check.
-            tags (list[tagData]): The list of existing tags.
+            taxonomy (str): The taxonomy key, e.g. "tag" or "category".
+            name (str): The term name to check.
+            terms (list[T]): The list of existing terms.
             threshold (float): Cosine similarity threshold (0–1). Default 0.6.
 
         Returns:
-            tagData | None: The existing tag if semantically similar,
-                          otherwise None.
+            T | None: The existing term if semantically similar, otherwise None.
         """
-        if not tags:
+        if not terms:
             return None
 
-        # Prepare list of texts: new tag first + all existing names
-        names = [new_tag] + [t.name for t in tags]
-
-        # Get all embeddings in one async call
-        embeddings = await self.get_embeddings(names)
-
-        new_vector = np.array(embeddings[0])
-        existing_vectors = [np.array(v) for v in embeddings[1:]]
-
-        # Compute cosine similarities
-        similarities = [
-            np.dot(new_vector, ev) / (norm(new_vector) * norm(ev))
-            for ev in existing_vectors
-        ]
-
-        # Find best match
-        best_idx = int(np.argmax(similarities))
-        best_similarity = similarities[best_idx]
-
+        best_match, best_similarity = (await self.find_similar(taxonomy, name, terms))[0]
         if best_similarity >= threshold:
-            best_match = tags[best_idx]
-            print(f"Found similar tag: {best_match.name} (similarity={best_similarity:.2f})")
+            print(f"Found similar {taxonomy}: {best_match.name} (similarity={best_similarity:.2f})")
             return best_match
 
-        print(f"No similar tag found (max similarity={best_similarity:.2f})")
-        return None
\ No newline at end of file
+        print(f"No similar {taxonomy} found (max similarity={best_similarity:.2f})")
+        return None
+
+    async def check_category_exists_vector(
+        self,
+        new_category: str,
+        categories: list[CategoryData] | None = None,
+        threshold: float = 0.6
+    ) -> CategoryData | None:
+        """Check if a semantically similar category exists. See ``match_term``."""
+        return await self.match_term("category", new_category, categories, threshold)
+
+    async def check_tag_exists_vector(
+        self,
+        new_tag: str,
+        tags: list[TagData] | None = None,
+        threshold: float = 0.6
+    ) -> TagData | None:
+        """Check if a semantically similar tag exists. See ``match_term``."""
+        return await self.match_term("tag", new_tag, tags, threshold)
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from domain.wordpress import CategoryData, TagData
+
+T = TypeVar("T", TagData, CategoryData)
+
+
+def normalize_term_name(name: str) -> str:
+    return name.strip().casefold()
+
+
+class TaxonomyCache(Generic[T]):
+    """In-memory index of one WordPress taxonomy (tags or categories).
+
+    The full term list is loaded once and then served locally by id, name and
+    slug; names are matched ignoring case and surrounding whitespace. Every entry expires ``ttl`` seconds after it was stored. Terms created
+    through the client are written through with ``add`` so they are visible
+    immediately.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self._by_id: dict[int, T] = {}
+        self._by_name: dict[str, T] = {}
+        self._by_slug: dict[str, T] = {}
+        self._stored_at: dict[int, float] = {}
+        self._loaded_at: float | None = None
+        self._load_task: asyncio.Task | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[list[T]]]) -> list[T]:
+        """Load the taxonomy with ``loader`` if it is missing or expired.
+
+        Concurrent callers share a single in-flight load.
+        Returns:
+            All cached terms.
+        """
+        if self.is_loaded:
+            return self.all()
+
+        loop = asyncio.get_running_loop()
+        task = self._load_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._load(loader))
+            self._load_task = task
+        await asyncio.shield(task)
+        return self.all()
+
+    async def _load(self, loader: Callable[[], Awaitable[list[T]]]) -> None:
+        self.replace(await loader())
+
+    def replace(self, items: list[T]) -> None:
+        """Replace the cached terms with ``items`` and restart the TTL."""
+        self._by_id.clear()
+        self._by_name.clear()
+        self._by_slug.clear()
+        self._stored_at.clear()
+        for item in items:
+            self.add(item)
+        self._loaded_at = time.monotonic()
+
+    def add(self, item: T) -> T:
+        previous = self._by_id.get(item.id)
+        if previous is not None:
+            # A renamed term must not stay reachable under its old name or slug.
+            if self._by_name.get(normalize_term_name(previous.name)) is previous:
+                del self._by_name[normalize_term_name(previous.name)]
+            if self._by_slug.get(previous.slug) is previous:
+                del self._by_slug[previous.slug]
+        self._by_id[item.id] = item
+        self._by_name[normalize_term_name(item.name)] = item
+        self._by_slug[item.slug] = item
+        self._stored_at[item.id] = time.monotonic()
+        return item
+
+    def merge(self, model: type[T], fields: dict) -> T:
+        """Store a possibly partial term, keeping the cached values of fields it lacks."""
+        cached = self._by_id.get(fields["id"])
+        if cached is None:
+            return self.add(model(**fields))
+        return self.add(cached.model_copy(
+            update={key: value for key, value in fields.items() if key in model.model_fields}
+        ))
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _fresh(self, item: T | None) -> T | None:
+        if item is None:
+            return None
+        stored_at = self._stored_at.get(item.id)
+        if stored_at is None or time.monotonic() - stored_at >= self.ttl:
+            return None
+        return item
+
+    def get_by_id(self, item_id: int) -> T | None:
+        return self._fresh(self._by_id.get(item_id))
+
+    def get_by_name(self, name: str) -> T | None:
+        return self._fresh(self._by_name.get(normalize_term_name(name)))
+
+    def get_by_slug(self, slug: str) -> T | None:
+        return self._fresh(self._by_slug.get(slug))
+
+    def all(self) -> list[T]:
+        return [item for item in self._by_id.values() if self._fresh(item)]
@@ -0,0 +1,111 @@
+from typing import Generic, TypeVar
+
+import numpy as np
+
+from domain.wordpress import CategoryData, TagData
+
+T = TypeVar("T", TagData, CategoryData)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a 2D array; zero rows are left as zeros."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class TaxonomyIndex(Generic[T]):
+    """Contiguous, L2-normalized float32 embedding matrix for one taxonomy.
+
+    Rows are appended in place (the buffer grows geometrically), so adding a
+    term does not copy the whole matrix. Cosine similarity against every term
+    is a single matrix-vector product.
+    """
+
+    def __init__(self):
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._items: list[T] = []
+        self._rows: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def missing(self, items: list[T]) -> list[T]:
+        """Return the terms that are not indexed yet or were renamed."""
+        result = []
+        for item in items:
+            row = self._rows.get(item.id)
+            if row is None or self._items[row].name != item.name:
+                result.append(item)
+        return result
+
+    def retain(self, items: list[T]) -> None:
+        """Drop indexed terms that are not part of ``items`` any more."""
+        keep_ids = {item.id for item in items}
+        if keep_ids.issuperset(self._rows):
+            return
+        rows = sorted(row for item_id, row in self._rows.items() if item_id in keep_ids)
+        # Compact in place, keeping the allocated capacity for later upserts.
+        if rows:
+            self._matrix[:len(rows)] = self._matrix[rows]
+        self._items = [self._items[row] for row in rows]
+        self._rows = {item.id: row for row, item in enumerate(self._items)}
+        self._size = len(rows)
+
+    def upsert(self, items: list[T], vectors: list[list[float]]) -> None:
+        """Insert or replace terms together with their raw embedding vectors."""
+        if not items:
+            return
+        normalized = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        by_id = {item.id: (item, vector) for item, vector in zip(items, normalized)}
+
+        new_vectors = []
+        for item_id, (item, vector) in by_id.items():
+            row = self._rows.get(item_id)
+            if row is not None:
+                self._items[row] = item
+                self._matrix[row] = vector
+            else:
+                self._rows[item_id] = self._size + len(new_vectors)
+                self._items.append(item)
+                new_vectors.append(vector)
+        if not new_vectors:
+            return
+
+        needed = self._size + len(new_vectors)
+        if self._matrix.shape[0] < needed:
+            capacity = max(needed, 2 * self._matrix.shape[0], 64)
+            grown = np.empty((capacity, normalized.shape[1]), dtype=np.float32)
+            if self._size:
+                grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size:needed] = np.stack(new_vectors)
+        self._size = needed
+
+    def top_k(self, query: list[float], k: int = 1) -> list[tuple[T, float]]:
+        """Return the ``k`` most similar terms to ``query``, best first."""
+        if not self._size:
+            return []
+        vector = normalize_rows(np.asarray([query], dtype=np.float32))[0]
+        scores = self._matrix[:self._size] @ vector
+        k = min(k, self._size)
+        if k < self._size:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(self._size)
+        best = best[np.argsort(-scores[best])]
+        return [(self._items[row], float(scores[row])) for row in best]
+
+    def best_matches(self, queries: list[list[float]]) -> list[tuple[T, float] | None]:
+        """Return the best term for each query from one (N queries x M terms) product."""
+        if not queries:
+            return []
+        if not self._size:
+            return [None] * len(queries)
+        vectors = normalize_rows(np.asarray(queries, dtype=np.float32))
+        scores = vectors @ self._matrix[:self._size].T
+        best = np.argmax(scores, axis=1)
+        return [
+            (self._items[row], float(scores[i, row])) for i, row in enumerate(best)
+        ]
@@ -1,7 +1,15 @@
+import asyncio
+import base64
 from functools import cache
+import json
+import logging
 import os
+import time
+from typing import AsyncIterator, TypeVar
 
 from langchain_openai import OpenAIEmbeddings
+from client.errors import AuthError, ClientError
+from client.rate_limit import get_provider_limiter
 from client.request_data import BaseRequest
 from domain.wordpress import (
     CategoryData,
@@ -14,128 +22,327 @@ from domain.wordpress import (
     Token,
     SimplePostData,
 )
+from client.embedding_cache import EmbeddingCache
 from client.tag_category_embedding import EmbeddingHandler
+from client.taxonomy_cache import TaxonomyCache, normalize_term_name
 from dotenv import load_dotenv
 
 import settings
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+TermT = TypeVar("TermT", Tag, Category)
+
+# ``_fields`` projections: only request what the target models read.
+SIMPLE_POST_FIELDS = "id,title,slug,modified,categories,tags"
+POST_FIELDS = SIMPLE_POST_FIELDS + ",content"
+# ``_embed`` only survives ``_fields`` when the links and embedded blocks are kept.
+EMBED_FIELDS = "_links,_embedded"
+CATEGORY_FIELDS = ",".join(CategoryData.model_fields)
+TAG_FIELDS = ",".join(TagData.model_fields)
+
 
 class WordPressClient:
     def __init__(
         self, request_data: BaseRequest, base_url: str, username: str, password: str,
-        embedding_handler: EmbeddingHandler
+        embedding_handler: EmbeddingHandler, token_refresh_margin: float = 60,
+        token_validate_interval: float = 300, taxonomy_cache_ttl: float = 600,
+        per_page: int = 100, page_concurrency: int = 4,
     ):
         self.request_data = request_data
         self.base_url = base_url
         self.username = username
         self.password = password
         self.embedding_handler = embedding_handler
+        self.token_refresh_margin = token_refresh_margin
+        self.token_validate_interval = token_validate_interval
+        self.per_page = per_page
+        self.page_concurrency = page_concurrency
+        self._token: Token | None = None
+        self._token_expires_at: float | None = None
+        self._token_checked_at: float = 0.0
+        self._token_task: asyncio.Task | None = None
+        self.tag_cache: TaxonomyCache[TagData] = TaxonomyCache(taxonomy_cache_ttl)
+        self.category_cache: TaxonomyCache[CategoryData] = TaxonomyCache(taxonomy_cache_ttl)
+
+    async def __aenter__(self) -> "WordPressClient":
+        await self.request_data.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP session."""
+        await self.request_data.aclose()
+
+    async def _iter_collection(
+        self, path: str, params: dict | None = None
+    ) -> AsyncIterator[dict]:
+        """Yield every item of a paginated REST collection.
+
+        The first page tells us ``X-WP-TotalPages``; the remaining pages are
+        fetched concurrently, at most ``page_concurrency`` at a time, and their
+        items are yielded in page order, i.e. in the server's order.
+        """
+        url = self.base_url + path
+        params = {"per_page": self.per_page, **(params or {})}
+        first_page, headers = await self.request_data.aget_with_headers(
+            url, params={**params, "page": 1}
+        )
+        for item in first_page:
+            yield item
+
+        total_pages = int(headers.get("X-WP-TotalPages") or 1)
+        pages = iter(range(2, total_pages + 1))
+        pending: dict[int, asyncio.Task] = {}
+
+        def schedule_pages() -> None:
+            while len(pending) < self.page_concurrency:
+                page = next(pages, None)
+                if page is None:
+                    return
+                pending[page] = asyncio.create_task(
+                    self.request_data.aget(url, params={**params, "page": page})
+                )
+
+        try:
+            schedule_pages()
+            for page in range(2, total_pages + 1):
+                # Pages are scheduled in order, so the next one is always in flight.
+                items = await pending.pop(page)
+                schedule_pages()
+                for item in items:
+                    yield item
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    async def iter_posts(
+        self, params: dict | None = None, fields: str = SIMPLE_POST_FIELDS
+    ) -> AsyncIterator[SimplePostData]:
+        """Stream all posts, page by page.
+        Args:
+            params(dict): Extra query parameters to pass to the API.
+            fields(str): The ``_fields`` projection to request.
+        Returns:
+            An async iterator of SimplePostData objects.
+        """
+        params = {**(params or {}), "_fields": fields}
+        async for post in self._iter_collection("/wp-json/wp/v2/posts", params):
+            yield await self._create_post_object(post, simple=True)
 
-
-    async def get_posts(self) -> list[SimplePostData]:
+    async def get_posts(
+        self, params: dict | None = None, fields: str = SIMPLE_POST_FIELDS
+    ) -> list[SimplePostData]:
         """Get all posts.
         Args:
             params(dict): The parameters to pass to the API.
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A list of WordPressPostData objects.
         """
-        url = self.base_url + "/wp-json/wp/v2/posts"
-        result = [
-            await self._create_post_object(post, simple=True)
-            for post in await self.request_data.aget(url)
-        ]
-        return result
+        return [post async for post in self.iter_posts(params, fields)]
 
-    async def get_post(self, post_id: int) -> WordPressPostData:
+    async def get_post(
+        self, post_id: int, fields: str = POST_FIELDS + "," + EMBED_FIELDS
+    ) -> WordPressPostData:
         """Get a post by its ID.
         Args:
             post_id(int): The ID of the post to get.
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A WordPressPostData object.
         """
         url = self.base_url + f"/wp-json/wp/v2/posts/{post_id}"
-        reponse = await self.request_data.aget(url)
+        reponse = await self.request_data.aget(
+            url, params={"_embed": "wp:term", "_fields": fields}
+        )
         post_obj = await self._create_post_object(reponse)
         return post_obj
 
-    async def get_post_by_slug(self, post_slug: str) -> dict:
-        url = self.base_url + f"/wp-json/wp/v2/posts?slug={post_slug}"
-        return await self.request_data.aget(url)
+    async def get_posts_full(
+        self, post_ids: list[int], fields: str = POST_FIELDS + "," + EMBED_FIELDS
+    ) -> list[WordPressPostData]:
+        """Get many posts with their categories and tags hydrated.
+        Posts are fetched with ``include`` and ``_embed``; terms that are not
+        embedded are fetched once for the whole batch.
+        Args:
+            post_ids(list[int]): The IDs of the posts to get.
+            fields(str): The ``_fields`` projection to request.
+        Returns:
+            A list of WordPressPostData objects, in ``post_ids`` order.
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        chunks = [
+            post_ids[start:start + self.per_page]
+            for start in range(0, len(post_ids), self.per_page)
+        ]
+        pages = await asyncio.gather(*(
+            self.request_data.aget(
+                self.base_url + "/wp-json/wp/v2/posts",
+                params={
+                    "include": ",".join(map(str, chunk)),
+                    "per_page": len(chunk),
+                    "_embed": "wp:term",
+                    "_fields": fields,
+                },
+            )
+            for chunk in chunks
+        ))
+        posts = {post["id"]: post for page in pages for post in page}
+
+        for post in posts.values():
+            self._cache_embedded_terms(post)
+        await self._prefetch_terms(
+            [cat_id for post in posts.values() for cat_id in post.get("categories", [])],
+            [tag_id for post in posts.values() for tag_id in post.get("tags", [])],
+        )
+        return [
+            await self._create_post_object(posts[post_id])
+            for post_id in post_ids
+            if post_id in posts
+        ]
+
+    async def get_post_by_slug(self, post_slug: str, fields: str | None = SIMPLE_POST_FIELDS) -> dict:
+        url = self.base_url + "/wp-json/wp/v2/posts"
+        return await self.request_data.aget(url, params=_with_fields({"slug": post_slug}, fields))
 
-    async def get_post_by_title(self, post_title: str) -> dict:
-        url = self.base_url + f"/wp-json/wp/v2/posts?search={post_title}"
-        return await self.request_data.aget(url)
+    async def get_post_by_title(self, post_title: str, fields: str | None = SIMPLE_POST_FIELDS) -> dict:
+        url = self.base_url + "/wp-json/wp/v2/posts"
+        return await self.request_data.aget(url, params=_with_fields({"search": post_title}, fields))
 
-    async def get_post_by_category(self, category_id: int) -> dict:
-        url = self.base_url + f"/wp-json/wp/v2/posts?category={category_id}"
-        return await self.request_data.aget(url)
+    async def get_post_by_category(self, category_id: int, fields: str | None = SIMPLE_POST_FIELDS) -> dict:
+        url = self.base_url + "/wp-json/wp/v2/posts"
+        return await self.request_data.aget(url, params=_with_fields({"categories": category_id}, fields))
 
-    async def get_post_by_tag(self, tag_id: int) -> dict:
-        url = self.base_url + f"/wp-json/wp/v2/posts?tag={tag_id}"
-        return await self.request_data.aget(url)
+    async def get_post_by_tag(self, tag_id: int, fields: str | None = SIMPLE_POST_FIELDS) -> dict:
+        url = self.base_url + "/wp-json/wp/v2/posts"
+        return await self.request_data.aget(url, params=_with_fields({"tags": tag_id}, fields))
+
+    async def iter_categories(self, fields: str = CATEGORY_FIELDS) -> AsyncIterator[CategoryData]:
+        """Stream all categories, page by page.
+        Args:
+            fields(str): The ``_fields`` projection to request.
+        Returns:
+            An async iterator of Category objects.
+        """
+        params = {"_fields": fields}
+        async for category in self._iter_collection("/wp-json/wp/v2/categories", params):
+            yield CategoryData(**category)
 
-    async def get_categories(self) -> list[CategoryData]:
+    async def get_categories(self, fields: str = CATEGORY_FIELDS) -> list[CategoryData]:
         """Get all categories.
+        Args:
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A list of Category objects.
         """
-        url = self.base_url + "/wp-json/wp/v2/categories"
-        return [
-            CategoryData(**category) for category in await self.request_data.aget(url)
-        ]
-    
+        return [category async for category in self.iter_categories(fields)]
 
-    async def get_category(self, category_id: int) -> CategoryData:
+    async def get_cached_categories(self) -> list[CategoryData]:
+        """Get all categories from the taxonomy cache, loading it if expired.
+        Returns:
+            A list of Category objects.
+        """
+        return await self.category_cache.ensure_loaded(self.get_categories)
+
+    async def get_category(self, category_id: int, fields: str = CATEGORY_FIELDS) -> CategoryData:
         """Get a category by its ID.
         Args:
             category_id(int): The ID of the category to get.
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A Category object.
         """
+        cached = self.category_cache.get_by_id(category_id)
+        if cached:
+            return cached
         url = self.base_url + f"/wp-json/wp/v2/categories/{category_id}"
-        category = await self.request_data.aget(url)
-        return CategoryData(**category)
-
-    async def get_category_by_name(self, category_name: str) -> CategoryData:
-        url = self.base_url + f"/wp-json/wp/v2/categories?search={category_name}"
-        search_results = await self.request_data.aget(url)
+        category = await self.request_data.aget(url, params={"_fields": fields})
+        return self.category_cache.add(CategoryData(**category))
+
+    async def get_category_by_name(
+        self, category_name: str, fields: str = CATEGORY_FIELDS
+    ) -> CategoryData:
+        await self.get_cached_categories()
+        cached = self.category_cache.get_by_name(category_name)
+        if cached:
+            return cached
+
+        # Not in the cache: it may have been created elsewhere since the last load.
+        url = self.base_url + "/wp-json/wp/v2/categories"
+        search_results = await self.request_data.aget(
+            url, params={"search": category_name, "_fields": fields}
+        )
 
         for result in search_results:
             if result.get("name") == category_name:
-                return CategoryData(**result)
+                return self.category_cache.add(CategoryData(**result))
         return None
 
-    async def get_tags(self) -> list[TagData]:
+    async def iter_tags(self, fields: str = TAG_FIELDS) -> AsyncIterator[TagData]:
+        """Stream all tags, page by page.
+        Args:
+            fields(str): The ``_fields`` projection to request.
+        Returns:
+            An async iterator of Tag objects.
+        """
+        params = {"_fields": fields}
+        async for tag in self._iter_collection("/wp-json/wp/v2/tags", params):
+            yield TagData(**tag)
+
+    async def get_tags(self, fields: str = TAG_FIELDS) -> list[TagData]:
         """Get all tags.
+        Args:
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A list of Tag objects.
         """
-        url = self.base_url + "/wp-json/wp/v2/tags"
-        return [TagData(**tag) for tag in await self.request_data.aget(url)]
+        return [tag async for tag in self.iter_tags(fields)]
+
+    async def get_cached_tags(self) -> list[TagData]:
+        """Get all tags from the taxonomy cache, loading it if expired.
+        Returns:
+            A list of Tag objects.
+        """
+        return await self.tag_cache.ensure_loaded(self.get_tags)
 
-    async def get_tag(self, tag_id: int) -> TagData:
+    async def get_tag(self, tag_id: int, fields: str = TAG_FIELDS) -> TagData:
         """Get a tag by its ID.
         Args:
             tag_id(int): The ID of the tag to get.
+            fields(str): The ``_fields`` projection to request.
         Returns:
             A Tag object.
         """
+        cached = self.tag_cache.get_by_id(tag_id)
+        if cached:
+            return cached
         url = self.base_url + f"/wp-json/wp/v2/tags/{tag_id}"
-        tag = await self.request_data.aget(url)
-        return TagData(**tag)
+        tag = await self.request_data.aget(url, params={"_fields": fields})
+        return self.tag_cache.add(TagData(**tag))
+
+    async def get_tag_by_name(self, tag_name: str, fields: str = TAG_FIELDS) -> TagData:
+        await self.get_cached_tags()
+        cached = self.tag_cache.get_by_name(tag_name)
+        if cached:
+            return cached
 
-    async def get_tag_by_name(self, tag_name: str) -> TagData:
-        url = self.base_url + f"/wp-json/wp/v2/tags?search={tag_name}"
-        search_results = await self.request_data.aget(url)
+        # Not in the cache: it may have been created elsewhere since the last load.
+        url = self.base_url + "/wp-json/wp/v2/tags"
+        search_results = await self.request_data.aget(
+            url, params={"search": tag_name, "_fields": fields}
+        )
         for result in search_results:
             if result.get("name") == tag_name:
-                return TagData(**result)
+                return self.tag_cache.add(TagData(**result))
         return None
     
     async def check_tag_embedding(self, tag: Tag) -> TagData | None:
-        tags = await self.get_tags()
+        tags = await self.get_cached_tags()
         return await self.embedding_handler.check_tag_exists_vector(tag.name, tags)
 
     async def create_tag(self, tag: Tag) -> TagData:
@@ -152,18 +359,22 @@ class WordPressClient:
         if existing_tag:
             return existing_tag
         
+        return await self._insert_tag(tag)
+
+    async def _insert_tag(self, tag: Tag) -> TagData:
+        """POST a new tag, falling back to the existing one if WordPress reports it exists."""
         url = self.base_url + "/wp-json/wp/v2/tags"
-        token = await self.login_jwt()
-        header = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {token.token}",
-        }
-        return TagData(
-            **await self.request_data.apost(url, data=tag.model_dump(), headers=header)
-        )
-    
+        try:
+            response = await self._authorized_post(url, data=tag.model_dump())
+        except ClientError as e:
+            term_id = _existing_term_id(e.body)
+            if term_id is None:
+                raise
+            return await self.get_tag(term_id)
+        return self.tag_cache.add(TagData(**response))
+
     async def check_category_embedding(self, category: Category) -> CategoryData | None:
-        categories = await self.get_categories()
+        categories = await self.get_cached_categories()
         return await self.embedding_handler.check_category_exists_vector(category.name, categories)
 
     async def create_category(self, category: Category) -> CategoryData:
@@ -180,16 +391,74 @@ class WordPressClient:
         if existing_category:
             return existing_category
         
-        return CategoryData(
-            **await self.request_data.apost(
+        return await self._insert_category(category)
+
+    async def _insert_category(self, category: Category) -> CategoryData:
+        """POST a new category, falling back to the existing one if WordPress reports it exists."""
+        try:
+            response = await self._authorized_post(
                 url=self.base_url + "/wp-json/wp/v2/categories",
                 data=category.model_dump(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {(await self.login_jwt()).token}",
+            )
+        except ClientError as e:
+            term_id = _existing_term_id(e.body)
+            if term_id is None:
+                raise
+            return await self.get_category(term_id)
+        return self.category_cache.add(CategoryData(**response))
+
+    async def resolve_taxonomy(
+        self, post: GeneratePostData, threshold: float = 0.6
+    ) -> tuple[list[CategoryData], list[TagData]]:
+        """Resolve all categories and tags of a post to existing or new terms.
+        Exact name matches are served from the taxonomy cache, every remaining
+        candidate is matched in one embedding call, and only the true misses
+        are created, concurrently.
+        Args:
+            post(GeneratePostData): The generated post with candidate categories and tags.
+            threshold(float): Cosine similarity threshold for semantic matches.
+        Returns:
+            The resolved categories and tags, in candidate order.
+        """
+        existing_categories, existing_tags = await asyncio.gather(
+            self.get_cached_categories(), self.get_cached_tags()
+        )
+        categories = _unique_terms(post.categories or [])
+        tags = _unique_terms(post.tags or [])
+
+        resolved_categories = [self.category_cache.get_by_name(c.name) for c in categories]
+        resolved_tags = [self.tag_cache.get_by_name(t.name) for t in tags]
+        pending_categories = [i for i, found in enumerate(resolved_categories) if found is None]
+        pending_tags = [i for i, found in enumerate(resolved_tags) if found is None]
+
+        if pending_categories or pending_tags:
+            matches = await self.embedding_handler.match_many(
+                {
+                    "category": (
+                        [categories[i].name for i in pending_categories],
+                        existing_categories,
+                    ),
+                    "tag": ([tags[i].name for i in pending_tags], existing_tags),
                 },
+                threshold=threshold,
             )
+            for i, match in zip(pending_categories, matches["category"]):
+                resolved_categories[i] = match
+            for i, match in zip(pending_tags, matches["tag"]):
+                resolved_tags[i] = match
+
+        missing_categories = [i for i, found in enumerate(resolved_categories) if found is None]
+        missing_tags = [i for i, found in enumerate(resolved_tags) if found is None]
+        created = await asyncio.gather(
+            *(self._insert_category(categories[i]) for i in missing_categories),
+            *(self._insert_tag(tags[i]) for i in missing_tags),
         )
+        for i, term in zip(missing_categories, created[:len(missing_categories)]):
+            resolved_categories[i] = term
+        for i, term in zip(missing_tags, created[len(missing_categories):]):
+            resolved_tags[i] = term
+
+        return resolved_categories, resolved_tags
 
     async def create_post(self, post: CreateWordPressPostData) -> SimplePostData:
         """Create a post.
@@ -199,13 +468,8 @@ class WordPressClient:
             A WordPressPostData object.
         """
         url = self.base_url + "/wp-json/wp/v2/posts"
-        token = await self.login_jwt()
-        header = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {token.token}",
-        }
-        response = await self.request_data.apost(
-            url, data=post.model_dump(), headers=header
+        response = await self._authorized_post(
+            url, data=post.model_dump(exclude_none=True), params={"_fields": SIMPLE_POST_FIELDS}
         )
         return await self._create_post_object(response, simple=True)
 
@@ -218,36 +482,103 @@ class WordPressClient:
         Returns:
             A WordPressPostData object.
         """
-        categories = []
-        tags = []
-        if post.categories:
-            categories = [
-                (await self.create_category(category)).id
-                for category in post.categories
-            ]
-        if post.tags:
-            tags = [(await self.create_tag(tag)).id for tag in post.tags]
+        resolved_categories, resolved_tags = await self.resolve_taxonomy(post)
+        response = await self.publish_post(
+            post,
+            [category.id for category in resolved_categories],
+            [tag.id for tag in resolved_tags],
+        )
+        return bool(response.id)
 
+    async def publish_post(
+        self, post: GeneratePostData, category_ids: list[int], tag_ids: list[int]
+    ) -> SimplePostData:
+        """Publish a generated post with already resolved term IDs.
+        Reruns are deduplicated by the job ledger, not here; WordPress makes
+        a taken slug unique. The generated ``date`` is not sent, since it may
+        come from a cached response: WordPress publishes at now.
+        Args:
+            post(GeneratePostData): The generated post.
+            category_ids(list[int]): The resolved category IDs.
+            tag_ids(list[int]): The resolved tag IDs.
+        Returns:
+            A SimplePostData object.
+        """
         wp_post_dict = {
             "title": post.title,
             "content": post.content,
             "slug": post.slug,
-            "date": post.date,
-            "categories": categories,
-            "tags": tags,
+            "categories": list(dict.fromkeys(category_ids)),
+            "tags": list(dict.fromkeys(tag_ids)),
         }
-        response = await self.create_post(CreateWordPressPostData(**wp_post_dict))
-        return bool(response.id)
+        return await self.create_post(CreateWordPressPostData(**wp_post_dict))
 
     async def login_jwt(self) -> Token:
+        """Return a cached JWT token, logging in only when needed.
+        The token is refreshed ``token_refresh_margin`` seconds before its
+        ``exp`` claim. Concurrent callers share a single in-flight login.
+        Returns:
+            A Token object.
+        """
+        if self._token is not None and await self._token_is_fresh():
+            return self._token
+
+        loop = asyncio.get_running_loop()
+        task = self._token_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_jwt())
+            self._token_task = task
+        return await asyncio.shield(task)
+
+    async def _fetch_jwt(self) -> Token:
         url = self.base_url + "/wp-json/jwt-auth/v1/token"
         headers = {"Content-Type": "application/json"}
         response = await self.request_data.apost(
             url,
             data={"username": self.username, "password": self.password},
             headers=headers,
+            retry=True,
+        )
+        token = Token(**response)
+        self._token = token
+        self._token_expires_at = _decode_jwt_exp(token.token)
+        self._token_checked_at = time.time()
+        return token
+
+    async def _token_is_fresh(self) -> bool:
+        now = time.time()
+        if self._token_expires_at is not None:
+            return now < self._token_expires_at - self.token_refresh_margin
+
+        # No readable exp claim: fall back to the validate endpoint periodically.
+        if now - self._token_checked_at < self.token_validate_interval:
+            return True
+        response = await self.validate_token(self._token.token)
+        self._token_checked_at = now
+        return _is_valid_token_response(response)
+
+    def _invalidate_token(self, token: Token) -> None:
+        """Drop the cached token, unless another caller already replaced it."""
+        if self._token is token:
+            self._token = None
+            self._token_expires_at = None
+
+    async def _authorized_post(self, url: str, data: dict, params: dict | None = None) -> dict:
+        """POST with the cached JWT, retrying once with a fresh token on 401/403."""
+        token = await self.login_jwt()
+        try:
+            return await self.request_data.apost(
+                url, data=data, headers=_auth_headers(token), params=params
+            )
+        except AuthError:
+            pass
+
+        logger.info("JWT token rejected by %s, logging in again.", url)
+        self._invalidate_token(token)
+        token = await self.login_jwt()
+        return await self.request_data.apost(
+            url, data=data, headers=_auth_headers(token), params=params
         )
-        return Token(**response)
 
     async def _create_post_object(
         self, data: dict, simple: bool = False
@@ -269,22 +600,124 @@ class WordPressClient:
             obj.content = None
             return obj
 
+        self._cache_embedded_terms(data)
+        await self._prefetch_terms(category_ids, tag_ids)
+
         wordpress_post = WordPressPostData(**post_data)
-        wordpress_post.categories = (
-            [await self.get_category(cat_id) for cat_id in category_ids]
-            if category_ids
-            else []
+        # Everything is cached by now; get_* only hits the network for
+        # terms the include lookup could not return.
+        wordpress_post.categories = list(
+            await asyncio.gather(*(self.get_category(cat_id) for cat_id in category_ids))
         )
-        wordpress_post.tags = (
-            [await self.get_tag(tag_id) for tag_id in tag_ids] if tag_ids else []
+        wordpress_post.tags = list(
+            await asyncio.gather(*(self.get_tag(tag_id) for tag_id in tag_ids))
         )
         return wordpress_post
 
+    def _cache_embedded_terms(self, data: dict) -> None:
+        """Write terms from an ``_embed``-ed ``wp:term`` block into the taxonomy caches.
+
+        Embedded terms lack fields such as ``description``, ``count`` and
+        ``parent``, so they are merged into cached entries rather than
+        replacing them.
+        """
+        groups = (data.get("_embedded") or {}).get("wp:term") or []
+        for group in groups:
+            for term in group:
+                if term.get("taxonomy") == "category":
+                    self.category_cache.merge(CategoryData, term)
+                elif term.get("taxonomy") == "post_tag":
+                    self.tag_cache.merge(TagData, term)
+
+    async def _prefetch_terms(self, category_ids: list[int], tag_ids: list[int]) -> None:
+        """Fetch the distinct uncached term IDs concurrently, with one request per taxonomy."""
+        await asyncio.gather(
+            self._fetch_terms_by_ids(
+                "/wp-json/wp/v2/categories", category_ids, CategoryData,
+                self.category_cache, CATEGORY_FIELDS,
+            ),
+            self._fetch_terms_by_ids(
+                "/wp-json/wp/v2/tags", tag_ids, TagData, self.tag_cache, TAG_FIELDS,
+            ),
+        )
+
+    async def _fetch_terms_by_ids(
+        self, path: str, ids: list[int], model: type, cache: TaxonomyCache, fields: str
+    ) -> None:
+        missing = [term_id for term_id in dict.fromkeys(ids) if not cache.get_by_id(term_id)]
+        if not missing:
+            return
+        chunks = [
+            missing[start:start + self.per_page]
+            for start in range(0, len(missing), self.per_page)
+        ]
+        pages = await asyncio.gather(*(
+            self.request_data.aget(
+                self.base_url + path,
+                params={
+                    "include": ",".join(map(str, chunk)),
+                    "per_page": len(chunk),
+                    "_fields": fields,
+                },
+            )
+            for chunk in chunks
+        ))
+        for page in pages:
+            for term in page:
+                cache.add(model(**term))
+
     async def validate_token(self, token: str) -> dict:
         url = self.base_url + "/wp-json/jwt-auth/v1/token/validate"
-        return await self.request_data.aget(
-            url, headers={"Authorization": f"Bearer {token}"}
-        )
+        try:
+            return await self.request_data.aget(
+                url, headers={"Authorization": f"Bearer {token}"}
+            )
+        except ClientError as e:
+            # An invalid token is reported as a 403 with a ``jwt_auth_*`` code.
+            return e.body
+
+
+def _auth_headers(token: Token) -> dict:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token.token}",
+    }
+
+
+def _decode_jwt_exp(token: str) -> float | None:
+    """Read the ``exp`` claim from a JWT without verifying its signature."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _with_fields(params: dict, fields: str | None) -> dict:
+    # ``fields=None`` opts out of the projection and returns full posts.
+    return {**params, "_fields": fields} if fields else params
+
+
+def _existing_term_id(response: dict) -> int | None:
+    """Return the id from a ``term_exists`` error, which WordPress sends for duplicates."""
+    if isinstance(response, dict) and response.get("code") == "term_exists":
+        data = response.get("data") or {}
+        term_id = data.get("term_id") if isinstance(data, dict) else None
+        return int(term_id) if term_id is not None else None
+    return None
+
+
+def _unique_terms(terms: list[TermT]) -> list[TermT]:
+    """Drop candidates whose name repeats an earlier one (case-insensitive)."""
+    seen: dict[str, TermT] = {}
+    for term in terms:
+        seen.setdefault(normalize_term_name(term.name), term)
+    return list(seen.values())
+
+
+def _is_valid_token_response(response: dict) -> bool:
+    return isinstance(response, dict) and response.get("code") == "jwt_auth_valid_token"
 
 
 @cache
@@ -294,10 +727,36 @@ def get_wp_client() -> WordPressClient:
         api_key=settings.OPENAI_API_KEY,
         base_url=settings.OPENAI_BASE_URL,
     )
-    embedding_handler = EmbeddingHandler(settings.WP_BASE_URL, embeddings)
+    embedding_cache = (
+        EmbeddingCache(
+            settings.EMBEDDING_CACHE_PATH,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+        if settings.EMBEDDING_CACHE_PATH
+        else None
+    )
+    embedding_handler = EmbeddingHandler(
+        settings.WP_BASE_URL, embeddings, embedding_cache,
+        rate_limiter=get_provider_limiter("embeddings"),
+        batch_window=settings.EMBEDDING_BATCH_WINDOW,
+        max_batch_size=settings.EMBEDDING_MAX_BATCH,
+    )
 
-    request_data = BaseRequest()
+    request_data = BaseRequest(
+        timeout=settings.WP_REQUEST_TIMEOUT,
+        limit_per_host=settings.WP_POOL_LIMIT_PER_HOST,
+        rate_limit=settings.WP_RATE_LIMIT,
+        max_rate_limit=settings.WP_RATE_LIMIT_MAX,
+        max_retries=settings.WP_MAX_RETRIES,
+        retry_base_delay=settings.RETRY_BASE_DELAY,
+        retry_max_delay=settings.RETRY_MAX_DELAY,
+    )
     username = os.getenv("WP_USERNAME")
     password = os.getenv("WP_PASSWORD")
     base_url = os.getenv("WP_BASE_URL")
-    return WordPressClient(request_data, base_url, username, password, embedding_handler)
+    return WordPressClient(
+        request_data, base_url, username, password, embedding_handler,
+        taxonomy_cache_ttl=settings.WP_TAXONOMY_CACHE_TTL,
+        per_page=settings.WP_PER_PAGE,
+        page_concurrency=settings.WP_PAGE_CONCURRENCY,
+    )
@@ -45,6 +45,30 @@ class GeneratePostData(BaseModel):
     )
 
 
+class OutlineSection(BaseModel):
+    heading: str = Field(
+        description="The section heading; leave empty for the introduction"
+    )
+    key_points: list[str] = Field(
+        description="The points this section must cover"
+    )
+    target_words: int = Field(description="The approximate length of the section in words")
+
+
+class PostOutline(BaseModel):
+    title: str
+    slug: str = Field(description="The slug of the post should be english and unique")
+    sections: list[OutlineSection] = Field(
+        description="The sections of the post in reading order, starting with the introduction"
+    )
+    categories: list[Category] = Field(
+        description="The categories should be related to the content of the post"
+    )
+    tags: list[Tag] = Field(
+        description="The tags should be related to the content of the post"
+    )
+
+
 class WordPressPostData(BaseWordPressPost):
     id: int
 
@@ -58,6 +82,8 @@ class SimplePostData(BaseWordPressPost):
 
 class CreateWordPressPostData(BaseWordPressPost):
     id: int | None = None
+    # Left unset, WordPress publishes the post at request time.
+    date: str | None = None
     categories: list[int] | None = None
     tags: list[int] | None = None
     status: str = "publish"
@@ -69,3 +95,5 @@ class Token(BaseModel):
 
 class PostContext(BaseModel):
     user_prompt: str
+    # Job ledger id; set for scheduled runs so their stages are recorded and resumable.
+    job_id: str | None = None
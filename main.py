@@ -23,7 +23,10 @@ async def main():
 حداقل ۷۰۰ کلمه
     """
     print("---------------Start Agent-----------------")
-    result = await run_agent(user_prompt)
+    try:
+        result = await run_agent(user_prompt)
+    finally:
+        await wp_client.aclose()
 
     pprint(result)
     print("---------------End Agent-----------------")
@@ -1,51 +1,59 @@
-import pandas as pd
-import schedule
-import time
+import asyncio
 from datetime import datetime
-from autanimos_agent.agent import  run_agent
+from metrics import start_metrics_server
+from scheduling.cron import AsyncCronScheduler, SchedulerState
+from scheduling.planner import get_planner_store
+from scheduling.tasks import print_summary, row_job_id, run_tasks
+from scheduling.work_queue import get_work_queue
+from scheduling.worker import start_workers, supervise_workers
+import settings
 
-import asyncio
-# === Function to run for each matching row ===
-async def run_task(row):
-
-    prompt = f"""
-    Title: {row['title']}
-    Goal: {row['goal']}
-    Short explanation: {row['short explanation']}
-    minimum words: 700
-    SEO optimization: yes
-    language: Persian
-    output format: html , just use html tags that sutable for seo and readability.
-    do not use <html> , <body> , <head>
-    the reuslt use for create a new post in wordpress.
-    """
-    result = await run_agent(prompt)
-    print(result)
-
-# === Function to check today's items ===
-def check_today_tasks():
-    # Load Excel file (update file name/path if needed)
-    df = pd.read_excel("content-planer.xlsx")
-    
-    # Ensure consistent date format (handles strings like "11/12/25")
-    df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
-    
-    today = datetime.now().date()
-    today_tasks = df[df['date'] == today]
-
-    if today_tasks.empty:
-        print(f"No tasks for today ({today}).")
+
+def enqueue_rows(rows) -> int:
+    """Enqueue planner rows for the workers; rows already enqueued are ignored."""
+    queue = get_work_queue()
+    added = 0
+    for row in rows:
+        added += queue.enqueue(row_job_id(row), row)
+    return added
+
+
+# === Function to dispatch the rows due since the previous run ===
+async def dispatch_due_tasks(start: datetime, end: datetime):
+    rows = await asyncio.to_thread(get_planner_store().rows_due, start, end)
+
+    if not rows:
+        print(f"No tasks due between {start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M}.")
     else:
-        print(f"Tasks for today ({today}):")
-        for _, row in today_tasks.iterrows():
-            asyncio.run(run_task(row))
-
-# === Schedule to run every day at 09:00 ===
-schedule.every().day.at("09:00").do(check_today_tasks)
-# schedule.every().second.do(check_today_tasks)
-
-# === Keep running ===
-print("Scheduler started. Waiting for next run...")
-while True:
-    schedule.run_pending()
-    time.sleep(30)
\ No newline at end of file
+        print(f"{len(rows)} tasks due between {start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M}:")
+        if settings.SCHEDULER_WORKERS > 0:
+            added = await asyncio.to_thread(enqueue_rows, rows)
+            counts = await asyncio.to_thread(get_work_queue().counts)
+            print(f"Enqueued {added} new of {len(rows)} tasks; queue: {counts}")
+        else:
+            print_summary(await run_tasks(rows))
+
+
+async def main(workers=()):
+    if settings.METRICS_PORT:
+        await start_metrics_server(settings.METRICS_PORT)
+    scheduler = AsyncCronScheduler(
+        SchedulerState(settings.SCHEDULER_STATE_PATH),
+        catchup_horizon=settings.SCHEDULER_CATCHUP_HORIZON,
+    )
+    # === Check the planner on a cron schedule; missed runs are caught up on start ===
+    scheduler.add_job("content-planner", settings.SCHEDULER_CRON, dispatch_due_tasks)
+    if workers:
+        # === Restart worker processes that died ===
+        await asyncio.gather(scheduler.run(), supervise_workers(workers))
+    else:
+        await scheduler.run()
+
+
+if __name__ == "__main__":
+    # === Start the workers that consume the queue ===
+    workers = start_workers(settings.SCHEDULER_WORKERS)
+
+    # === Keep running ===
+    print(f"Scheduler started with {len(workers)} workers ({settings.SCHEDULER_CRON}).")
+    asyncio.run(main(workers))
@@ -0,0 +1,208 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import os
+import sqlite3
+import threading
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a single sleep, so wall-clock jumps (suspend, NTP) are noticed.
+MAX_SLEEP = 60.0
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# (name, lowest, highest) of the five cron fields; weekday 7 is Sunday, like 0.
+_FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7)]
+
+
+def _parse_field(spec: str, name: str, lowest: int, highest: int) -> set[int]:
+    values = set()
+    for part in spec.split(","):
+        value_range, _, step = part.partition("/")
+        if value_range == "*":
+            start, end = lowest, highest
+        elif "-" in value_range:
+            start, end = (int(value) for value in value_range.split("-", 1))
+        else:
+            start = int(value_range)
+            end = highest if step else start
+        if not lowest <= start <= end <= highest:
+            raise ValueError(f"Invalid {name} field in cron expression: {spec!r}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return {value % 7 for value in values} if name == "weekday" else values
+
+
+class CronExpression:
+    """A standard five-field cron expression (minute hour day month weekday).
+
+    Supports ``*``, lists, ranges, steps and the ``@daily``-style macros.
+    As in cron, when both day of month and weekday are restricted a day
+    matches if either of them does.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(spec, *field) for spec, field in zip(fields, _FIELDS)
+        )
+        # Like cron, a field starting with "*" (also "*/2") counts as unrestricted.
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        # datetime.weekday() counts from Monday, cron from Sunday.
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first fire time strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=5 * 366)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never fires")
+
+    def fire_times(self, start: datetime, end: datetime) -> list[datetime]:
+        """Return all fire times in ``(start, end]``."""
+        times = []
+        moment = self.next_after(start)
+        while moment <= end:
+            times.append(moment)
+            moment = self.next_after(moment)
+        return times
+
+
+class SchedulerState:
+    """Last completed fire time of each scheduled job, stored in SQLite."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS last_fired (job TEXT PRIMARY KEY, fired_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, job: str) -> datetime | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fired_at FROM last_fired WHERE job = ?", (job,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set(self, job: str, fired_at: datetime) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO last_fired (job, fired_at) VALUES (?, ?)",
+                (job, fired_at.isoformat()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# A job receives the window ``(start, end]`` it is responsible for.
+JobFunc = Callable[[datetime, datetime], Awaitable[None]]
+
+
+@dataclass
+class CronJob:
+    name: str
+    cron: CronExpression
+    func: JobFunc
+
+
+class AsyncCronScheduler:
+    """Run coroutine jobs on cron schedules inside the running event loop.
+
+    Each job sleeps until its next fire time and is then called with the
+    window ``(previous fire, this fire]``. The last completed fire is stored
+    in ``state``, so on startup fires missed while the process was down are
+    caught up -- as one combined window, going back at most
+    ``catchup_horizon`` seconds. A failed run is retried with the same
+    window at the next fire.
+    """
+
+    def __init__(self, state: SchedulerState, catchup_horizon: float = 24 * 3600):
+        self.state = state
+        self.catchup_horizon = catchup_horizon
+        self.jobs: list[CronJob] = []
+
+    def add_job(self, name: str, expression: str, func: JobFunc) -> CronJob:
+        job = CronJob(name=name, cron=CronExpression(expression), func=func)
+        self.jobs.append(job)
+        return job
+
+    async def _fire(self, job: CronJob, start: datetime, end: datetime) -> bool:
+        logger.info(f"Running {job.name} for window ({start}, {end}]")
+        try:
+            await job.func(start, end)
+        except Exception as e:
+            logger.exception(f"Scheduled job {job.name} failed: {e!r}")
+            return False
+        await asyncio.to_thread(self.state.set, job.name, end)
+        return True
+
+    async def _run_job(self, job: CronJob) -> None:
+        now = datetime.now()
+        horizon = now - timedelta(seconds=self.catchup_horizon)
+        last = await asyncio.to_thread(self.state.get, job.name)
+        if last is None:
+            # First run ever: nothing counts as missed, start from now.
+            last = now
+        elif last < horizon:
+            logger.warning(f"{job.name} last ran at {last}; catching up from {horizon} only")
+            last = horizon
+
+        missed = job.cron.fire_times(last, now)
+        if missed and await self._fire(job, last, missed[-1]):
+            last = missed[-1]
+
+        while True:
+            next_fire = job.cron.next_after(max(last, datetime.now()))
+            while (delay := (next_fire - datetime.now()).total_seconds()) > 0:
+                await asyncio.sleep(min(delay, MAX_SLEEP))
+            if await self._fire(job, last, next_fire):
+                last = next_fire
+
+    async def run(self) -> None:
+        """Run all jobs until cancelled."""
+        logger.info(f"Cron scheduler started with {[(job.name, job.cron.expression) for job in self.jobs]}")
+        await asyncio.gather(*(self._run_job(job) for job in self.jobs))
@@ -0,0 +1,152 @@
+from functools import cache
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from pydantic import BaseModel
+
+from domain.wordpress import GeneratePostData
+import settings
+
+# Pipeline stages, in the order a job passes through them.
+STAGE_PENDING = "pending"
+STAGE_GENERATED = "generated"
+STAGE_TAXONOMY_RESOLVED = "taxonomy_resolved"
+STAGE_PUBLISHED = "published"
+STAGES = [STAGE_PENDING, STAGE_GENERATED, STAGE_TAXONOMY_RESOLVED, STAGE_PUBLISHED]
+
+
+def make_job_id(*parts: object) -> str:
+    """Derive a stable job id from the identifying fields of a planner row."""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+
+
+class Job(BaseModel):
+    job_id: str
+    title: str | None = None
+    stage: str = STAGE_PENDING
+    generated_post: GeneratePostData | None = None
+    category_ids: list[int] | None = None
+    tag_ids: list[int] | None = None
+    post_id: int | None = None
+    attempts: int = 0
+    error: str | None = None
+    updated_at: float = 0.0
+
+    def reached(self, stage: str) -> bool:
+        return STAGES.index(self.stage) >= STAGES.index(stage)
+
+
+class JobLedger:
+    """Durable record of scheduler jobs and the last pipeline stage each completed.
+
+    Each stage stores what the next one needs (the generated post, the
+    resolved term IDs, the WordPress post ID), so a restarted or repeated run
+    resumes from where the previous one stopped instead of starting over.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                title TEXT,
+                stage TEXT NOT NULL,
+                generated_post TEXT,
+                category_ids TEXT,
+                tag_ids TEXT,
+                post_id INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT job_id, title, stage, generated_post, category_ids, tag_ids,
+                       post_id, attempts, error, updated_at
+                FROM jobs WHERE job_id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            job_id=row[0],
+            title=row[1],
+            stage=row[2],
+            generated_post=GeneratePostData.model_validate_json(row[3]) if row[3] else None,
+            category_ids=json.loads(row[4]) if row[4] else None,
+            tag_ids=json.loads(row[5]) if row[5] else None,
+            post_id=row[6],
+            attempts=row[7],
+            error=row[8],
+            updated_at=row[9],
+        )
+
+    def get_or_create(self, job_id: str, title: str | None = None) -> Job:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, title, stage, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, title, STAGE_PENDING, time.time()),
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def _update(self, job_id: str, **values) -> None:
+        values["updated_at"] = time.time()
+        columns = ", ".join(f"{column} = ?" for column in values)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {columns} WHERE job_id = ?", [*values.values(), job_id]
+            )
+            self._conn.commit()
+
+    def record_generated(self, job_id: str, post: GeneratePostData) -> None:
+        self._update(
+            job_id, stage=STAGE_GENERATED, generated_post=post.model_dump_json(), error=None
+        )
+
+    def record_taxonomy(self, job_id: str, category_ids: list[int], tag_ids: list[int]) -> None:
+        self._update(
+            job_id,
+            stage=STAGE_TAXONOMY_RESOLVED,
+            category_ids=json.dumps(category_ids),
+            tag_ids=json.dumps(tag_ids),
+            error=None,
+        )
+
+    def record_published(self, job_id: str, post_id: int | None) -> None:
+        self._update(job_id, stage=STAGE_PUBLISHED, post_id=post_id, error=None)
+
+    def record_failure(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = ?, updated_at = ? WHERE job_id = ?",
+                (error, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def get_job_ledger() -> JobLedger:
+    return JobLedger(settings.JOB_LEDGER_PATH)
@@ -0,0 +1,190 @@
+from datetime import datetime, time
+from functools import cache
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any
+
+import pandas as pd
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+# Optional planner column with the time of day a row should be published.
+PUBLISH_TIME_COLUMN = "publish time"
+
+
+def _publish_time(value, default: time) -> time:
+    if isinstance(value, time):
+        return value
+    if isinstance(value, datetime):
+        return value.time()
+    if isinstance(value, str) and value.strip():
+        return time.fromisoformat(value.strip())
+    return default
+
+
+def _iso(moment: datetime) -> str:
+    # Fixed width, so the stored strings sort and compare chronologically.
+    return moment.isoformat(timespec="microseconds")
+
+
+def load_planner(path: str = settings.PLANNER_PATH) -> pd.DataFrame:
+    """Read the content planner and add a ``publish_at`` datetime to each row.
+
+    A row is published at its "publish time" cell if it has one, at the time
+    part of its date cell if that is not midnight, and otherwise at
+    ``SCHEDULER_DEFAULT_PUBLISH_TIME``.
+    """
+    df = pd.read_excel(path)
+    default = time.fromisoformat(settings.SCHEDULER_DEFAULT_PUBLISH_TIME)
+
+    # Ensure consistent date format (handles strings like "11/12/25")
+    timestamps = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = timestamps.dt.date
+
+    times = df[PUBLISH_TIME_COLUMN] if PUBLISH_TIME_COLUMN in df else [None] * len(df)
+    publish_at = []
+    for index, timestamp, value in zip(df.index, timestamps, times):
+        if pd.isna(timestamp):
+            publish_at.append(pd.NaT)
+            continue
+        fallback = timestamp.time() if timestamp.time() != time() else default
+        try:
+            publish_time = _publish_time(value, fallback)
+        except ValueError:
+            logger.warning(
+                f"Planner row {index}: invalid {PUBLISH_TIME_COLUMN} {value!r}, using {fallback}"
+            )
+            publish_time = fallback
+        publish_at.append(datetime.combine(timestamp.date(), publish_time))
+    df['publish_at'] = pd.to_datetime(pd.Series(publish_at, index=df.index, dtype="object"))
+    return df
+
+
+class PlannerStore:
+    """Date-indexed copy of the content planner in a local SQLite file.
+
+    ``refresh`` re-parses the spreadsheet only when its size or mtime changed
+    and its content hash differs from the one already imported, or when
+    ``SCHEDULER_DEFAULT_PUBLISH_TIME`` changed since the import; otherwise
+    due rows are answered from an index on ``publish_at`` without touching
+    the spreadsheet. The methods block, so call them via ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = source
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS source (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                fingerprint TEXT NOT NULL,
+                options TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                id INTEGER PRIMARY KEY,
+                publish_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rows_publish_at ON rows (publish_at)")
+        columns = {column[1] for column in self._conn.execute("PRAGMA table_info(source)")}
+        if "options" not in columns:
+            # Stores created before the options column re-import once.
+            self._conn.execute("ALTER TABLE source ADD COLUMN options TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha256()
+        with open(self.source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _options() -> str:
+        # Settings the imported publish times depend on; changing them re-imports.
+        return json.dumps({"default_publish_time": settings.SCHEDULER_DEFAULT_PUBLISH_TIME})
+
+    def refresh(self) -> bool:
+        """Re-import the spreadsheet if it or the import options changed; returns True if it was re-parsed."""
+        stat = os.stat(self.source)
+        options = self._options()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, fingerprint, options FROM source WHERE path = ?", (self.source,)
+            ).fetchone()
+        current = row is not None and row[3] == options
+        if current and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return False
+
+        fingerprint = self._fingerprint()
+        if current and row[2] == fingerprint:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE source SET size = ?, mtime = ? WHERE path = ?",
+                    (stat.st_size, stat.st_mtime, self.source),
+                )
+                self._conn.commit()
+            return False
+
+        df = load_planner(self.source)
+        df = df[df['publish_at'].notna()]
+        values = df.drop(columns='publish_at')
+        values = values.astype(object).where(values.notna(), None)
+        records = [
+            (_iso(publish_at.to_pydatetime()), json.dumps(record, default=str, ensure_ascii=False))
+            for publish_at, record in zip(df['publish_at'], values.to_dict("records"))
+        ]
+        with self._lock:
+            self._conn.execute("DELETE FROM source")
+            self._conn.execute("DELETE FROM rows")
+            self._conn.executemany("INSERT INTO rows (publish_at, data) VALUES (?, ?)", records)
+            self._conn.execute(
+                "INSERT INTO source (path, size, mtime, fingerprint, options) VALUES (?, ?, ?, ?, ?)",
+                (self.source, stat.st_size, stat.st_mtime, fingerprint, options),
+            )
+            self._conn.commit()
+        logger.info(f"Imported {len(records)} planner rows from {self.source}")
+        return True
+
+    def rows_due(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Return the planner rows with ``start < publish_at <= end``, in publish order."""
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT publish_at, data FROM rows
+                WHERE publish_at > ? AND publish_at <= ?
+                ORDER BY publish_at, id
+                """,
+                (_iso(start), _iso(end)),
+            ).fetchall()
+        return [{**json.loads(data), "publish_at": publish_at} for publish_at, data in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def get_planner_store() -> PlannerStore:
+    return PlannerStore(settings.PLANNER_STORE_PATH, settings.PLANNER_PATH)
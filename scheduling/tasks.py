@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+import time
+
+from pydantic import BaseModel
+
+from autanimos_agent.agent import run_agent
+from client.wp_client import get_wp_client
+from scheduling.ledger import STAGE_PUBLISHED, get_job_ledger, make_job_id
+import settings
+
+
+class TaskResult(BaseModel):
+    title: str
+    status: str
+    started_at: datetime
+    duration: float
+    error: str | None = None
+
+
+def row_job_id(row) -> str:
+    """Identify a planner row by its date and content, so reruns map to the same job."""
+    return make_job_id(row['date'], row['title'], row['goal'], row['short explanation'])
+
+
+# === Function to run for each matching row ===
+async def run_task(row) -> str:
+    """Run one planner row and return its status ("success" or "skipped").
+
+    Rows already published according to the job ledger are skipped, and an
+    interrupted row resumes from its last completed stage.
+    """
+    job_id = row_job_id(row)
+    ledger = get_job_ledger()
+    job = await asyncio.to_thread(ledger.get_or_create, job_id, str(row['title']))
+    if job.reached(STAGE_PUBLISHED):
+        print(f"Task '{row['title']}' was already published (post {job.post_id}), skipping.")
+        return "skipped"
+
+    prompt = f"""
+    Title: {row['title']}
+    Goal: {row['goal']}
+    Short explanation: {row['short explanation']}
+    minimum words: 700
+    SEO optimization: yes
+    language: Persian
+    output format: html , just use html tags that sutable for seo and readability.
+    do not use <html> , <body> , <head>
+    the reuslt use for create a new post in wordpress.
+    """
+    try:
+        result = await run_agent(prompt, job_id=job_id)
+    except Exception as e:
+        await asyncio.to_thread(ledger.record_failure, job_id, repr(e))
+        raise
+    print(result)
+    return "success"
+
+
+async def run_isolated(row, semaphore: asyncio.Semaphore) -> TaskResult:
+    """Run one row under the concurrency limit; a failure is recorded, not raised."""
+    async with semaphore:
+        started_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            status = await run_task(row)
+        except Exception as e:
+            print(f"Task '{row['title']}' failed: {e!r}")
+            return TaskResult(
+                title=str(row["title"]),
+                status="failed",
+                started_at=started_at,
+                duration=time.perf_counter() - start,
+                error=repr(e),
+            )
+        return TaskResult(
+            title=str(row["title"]),
+            status=status,
+            started_at=started_at,
+            duration=time.perf_counter() - start,
+        )
+
+
+async def run_tasks(rows, concurrency: int = settings.SCHEDULER_CONCURRENCY) -> list[TaskResult]:
+    """Run all rows concurrently on one event loop, at most ``concurrency`` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        return await asyncio.gather(*(run_isolated(row, semaphore) for row in rows))
+    finally:
+        await get_wp_client().aclose()
+
+
+def print_summary(results: list[TaskResult]) -> None:
+    counts = {status: sum(result.status == status for result in results) for status in ("success", "skipped", "failed")}
+    print(
+        f"Finished {len(results)} tasks: {counts['success']} succeeded, "
+        f"{counts['skipped']} skipped, {counts['failed']} failed."
+    )
+    for result in results:
+        line = f"  [{result.status}] {result.title} ({result.duration:.1f}s)"
+        if result.error:
+            line += f" - {result.error}"
+        print(line)
@@ -0,0 +1,172 @@
+from functools import cache
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from pydantic import BaseModel
+
+import settings
+
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class QueueItem(BaseModel):
+    id: int
+    job_id: str
+    payload: dict[str, Any]
+    attempts: int
+
+
+class WorkQueue:
+    """Durable multi-process work queue backed by a local SQLite file.
+
+    A worker leases an item for ``visibility_timeout`` seconds. If it neither
+    acks, nacks nor extends the lease in time (e.g. the worker crashed), the
+    item becomes visible again and another worker picks it up. Items are
+    given up as failed after ``max_attempts`` leases.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, so leases can use an explicit BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS queue_status ON queue (status, available_at)"
+        )
+
+    def enqueue(self, job_id: str, payload: dict[str, Any]) -> bool:
+        """Add a job; returns False if a job with this id was already enqueued."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO queue (job_id, payload, status, available_at, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (job_id, json.dumps(payload, default=str), STATUS_QUEUED, now, now),
+            )
+        return cursor.rowcount == 1
+
+    def lease(self, owner: str, visibility_timeout: float) -> QueueItem | None:
+        """Lease the oldest visible item, or return None if there is none."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases whose attempts are used up are given up on.
+                self._conn.execute(
+                    """
+                    UPDATE queue SET status = ?, last_error = COALESCE(last_error, 'lease expired')
+                    WHERE status = ? AND lease_expires_at <= ? AND attempts >= ?
+                    """,
+                    (STATUS_FAILED, STATUS_LEASED, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    """
+                    SELECT id, job_id, payload, attempts FROM queue
+                    WHERE (status = ? AND available_at <= ?)
+                       OR (status = ? AND lease_expires_at <= ?)
+                    ORDER BY id LIMIT 1
+                    """,
+                    (STATUS_QUEUED, now, STATUS_LEASED, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    """
+                    UPDATE queue
+                    SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?
+                    WHERE id = ?
+                    """,
+                    (STATUS_LEASED, owner, now + visibility_timeout, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return QueueItem(id=row[0], job_id=row[1], payload=json.loads(row[2]), attempts=row[3] + 1)
+
+    def extend(self, item_id: int, owner: str, visibility_timeout: float) -> None:
+        """Push the lease deadline forward while the owner is still working."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE queue SET lease_expires_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + visibility_timeout, item_id, owner, STATUS_LEASED),
+            )
+
+    def ack(self, item_id: int, owner: str) -> bool:
+        """Mark a leased item done; returns False if ``owner`` no longer holds the lease."""
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE queue SET status = ?, lease_owner = NULL, last_error = NULL
+                WHERE id = ? AND lease_owner = ? AND status = ?
+                """,
+                (STATUS_DONE, item_id, owner, STATUS_LEASED),
+            )
+        return cursor.rowcount == 1
+
+    def nack(self, item_id: int, owner: str, error: str, retry_delay: float) -> bool:
+        """Release a failed item for a later retry, or mark it failed after ``max_attempts``.
+
+        Returns False if ``owner`` no longer holds the lease.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE queue
+                SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    available_at = ?, lease_owner = NULL, lease_expires_at = NULL, last_error = ?
+                WHERE id = ? AND lease_owner = ? AND status = ?
+                """,
+                (
+                    self.max_attempts, STATUS_FAILED, STATUS_QUEUED, time.time() + retry_delay,
+                    error, item_id, owner, STATUS_LEASED,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM queue GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def get_work_queue() -> WorkQueue:
+    return WorkQueue(settings.QUEUE_PATH, max_attempts=settings.QUEUE_MAX_ATTEMPTS)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+
+from client.rate_limit import backoff_delay
+from client.wp_client import get_wp_client
+from metrics import start_metrics_server
+from scheduling.tasks import run_task
+from scheduling.work_queue import QueueItem, WorkQueue, get_work_queue
+import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def _keep_leased(queue: WorkQueue, item: QueueItem, owner: str, visibility_timeout: float) -> None:
+    while True:
+        await asyncio.sleep(visibility_timeout / 3)
+        await asyncio.to_thread(queue.extend, item.id, owner, visibility_timeout)
+
+
+async def process_item(
+    queue: WorkQueue, item: QueueItem, owner: str, visibility_timeout: float
+) -> None:
+    """Run one queued planner row, then ack it or release it for a retry."""
+    heartbeat = asyncio.create_task(_keep_leased(queue, item, owner, visibility_timeout))
+    try:
+        status = await run_task(item.payload)
+    except Exception as e:
+        retry_delay = settings.QUEUE_RETRY_DELAY * 2 ** (item.attempts - 1)
+        logger.error(f"Job {item.job_id} failed (attempt {item.attempts}): {e!r}")
+        released = await asyncio.to_thread(queue.nack, item.id, owner, repr(e), retry_delay)
+    else:
+        logger.info(f"Job {item.job_id} finished: {status}")
+        released = await asyncio.to_thread(queue.ack, item.id, owner)
+    finally:
+        heartbeat.cancel()
+    if not released:
+        logger.warning(f"Lease on job {item.job_id} was lost to another worker; result not recorded.")
+
+
+async def worker_main(
+    owner: str,
+    concurrency: int = settings.SCHEDULER_CONCURRENCY,
+    visibility_timeout: float = settings.QUEUE_VISIBILITY_TIMEOUT,
+    poll_interval: float = settings.QUEUE_POLL_INTERVAL,
+    metrics_port: int | None = None,
+) -> None:
+    """Lease and run jobs forever, at most ``concurrency`` at a time."""
+    if metrics_port:
+        await start_metrics_server(metrics_port)
+    queue = get_work_queue()
+    semaphore = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+    lease_failures = 0
+    logger.info(f"Worker {owner} started with concurrency {concurrency}.")
+    try:
+        while True:
+            await semaphore.acquire()
+            try:
+                item = await asyncio.to_thread(queue.lease, owner, visibility_timeout)
+            except Exception as e:
+                # E.g. "database is locked" while other processes hold the queue.
+                semaphore.release()
+                delay = backoff_delay(lease_failures, poll_interval, 60)
+                lease_failures += 1
+                logger.error(f"Worker {owner} failed to lease a job ({e!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            lease_failures = 0
+            if item is None:
+                semaphore.release()
+                await asyncio.sleep(poll_interval)
+                continue
+
+            task = asyncio.create_task(process_item(queue, item, owner, visibility_timeout))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            task.add_done_callback(lambda _: semaphore.release())
+    finally:
+        for task in running:
+            task.cancel()
+        await get_wp_client().aclose()
+
+
+def run_worker_process(index: int) -> None:
+    owner = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    metrics_port = settings.METRICS_PORT + 1 + index if settings.METRICS_PORT else None
+    asyncio.run(worker_main(owner, metrics_port=metrics_port))
+
+
+def start_worker(index: int) -> multiprocessing.Process:
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_worker_process, args=(index,), daemon=True
+    )
+    process.start()
+    return process
+
+
+def start_workers(count: int = settings.SCHEDULER_WORKERS) -> list[multiprocessing.Process]:
+    """Start ``count`` worker processes, each with its own event loop."""
+    return [start_worker(index) for index in range(count)]
+
+
+def restart_dead_workers(processes: list[multiprocessing.Process]) -> int:
+    """Replace worker processes that exited, in place; returns how many were restarted."""
+    restarted = 0
+    for index, process in enumerate(processes):
+        if process.is_alive():
+            continue
+        logger.error(f"Worker {index} exited with code {process.exitcode}, restarting it.")
+        process.close()
+        processes[index] = start_worker(index)
+        restarted += 1
+    return restarted
+
+
+async def supervise_workers(
+    processes: list[multiprocessing.Process], interval: float = settings.WORKER_CHECK_INTERVAL
+) -> None:
+    """Keep the worker pool at full size for as long as the caller runs."""
+    while True:
+        await asyncio.sleep(interval)
+        restart_dead_workers(processes)
+
+
+if __name__ == "__main__":
+    # Run workers without the producer, e.g. `python -m scheduling.worker` in another container.
+    asyncio.run(supervise_workers(start_workers()))
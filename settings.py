@@ -5,11 +5,75 @@ load_dotenv()
 WP_USERNAME = os.getenv("WP_USERNAME")
 WP_PASSWORD = os.getenv("WP_PASSWORD")
 WP_BASE_URL = os.getenv("WP_BASE_URL")
+WP_REQUEST_TIMEOUT = int(os.getenv("WP_REQUEST_TIMEOUT", "10"))
+WP_POOL_LIMIT_PER_HOST = int(os.getenv("WP_POOL_LIMIT_PER_HOST", "10"))
+WP_TAXONOMY_CACHE_TTL = float(os.getenv("WP_TAXONOMY_CACHE_TTL", "600"))
+WP_PER_PAGE = int(os.getenv("WP_PER_PAGE", "100"))
+WP_PAGE_CONCURRENCY = int(os.getenv("WP_PAGE_CONCURRENCY", "4"))
+# Requests/second per host; the limiter adapts between the initial and max rate.
+WP_RATE_LIMIT = float(os.getenv("WP_RATE_LIMIT", "10"))
+WP_RATE_LIMIT_MAX = float(os.getenv("WP_RATE_LIMIT_MAX", "50"))
+WP_MAX_RETRIES = int(os.getenv("WP_MAX_RETRIES", "3"))
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
 CHAT_MODEL = os.getenv("CHAT_MODEL")
 MODEL_PROVIDER = os.getenv("MODEL_PROVIDER")
+# Calls/second per provider endpoint (chat, embeddings), adapted like WP_RATE_LIMIT.
+PROVIDER_RATE_LIMIT = float(os.getenv("PROVIDER_RATE_LIMIT", "5"))
+PROVIDER_RATE_LIMIT_MAX = float(os.getenv("PROVIDER_RATE_LIMIT_MAX", "20"))
+PROVIDER_MAX_RETRIES = int(os.getenv("PROVIDER_MAX_RETRIES", "2"))
+
+# Jittered exponential backoff; a longer Retry-After fails the call instead of waiting.
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30"))
+
+# Set EMBEDDING_CACHE_PATH to an empty value to disable the on-disk embedding cache.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+# Concurrent embedding requests within this many seconds share one provider call; 0 disables.
+EMBEDDING_BATCH_WINDOW = float(os.getenv("EMBEDDING_BATCH_WINDOW", "0.01"))
+EMBEDDING_MAX_BATCH = int(os.getenv("EMBEDDING_MAX_BATCH", "1000"))
+
+# Set LLM_CACHE_PATH to an empty value to disable the LLM response cache.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() in ("1", "true", "yes")
+
+# "pipeline" generates and publishes directly; "agent" uses the tool-calling agent.
+AGENT_MODE = os.getenv("AGENT_MODE", "pipeline")
+
+# Generate long posts as an outline plus sections written in parallel.
+SECTIONED_GENERATION = os.getenv("SECTIONED_GENERATION", "false").lower() in ("1", "true", "yes")
+SECTION_CONCURRENCY = int(os.getenv("SECTION_CONCURRENCY", "4"))
+
+SCHEDULER_CONCURRENCY = int(os.getenv("SCHEDULER_CONCURRENCY", "4"))
+JOB_LEDGER_PATH = os.getenv("JOB_LEDGER_PATH", "data/jobs.sqlite3")
+
+# Worker processes consuming the queue; 0 runs rows inside the scheduler process.
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+QUEUE_PATH = os.getenv("QUEUE_PATH", "data/queue.sqlite3")
+QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("QUEUE_VISIBILITY_TIMEOUT", "900"))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+QUEUE_RETRY_DELAY = float(os.getenv("QUEUE_RETRY_DELAY", "60"))
+QUEUE_POLL_INTERVAL = float(os.getenv("QUEUE_POLL_INTERVAL", "5"))
+# Seconds between checks for dead worker processes, which are restarted.
+WORKER_CHECK_INTERVAL = float(os.getenv("WORKER_CHECK_INTERVAL", "10"))
+
+# The scheduler enqueues planner rows whose publish time falls between two fires.
+PLANNER_PATH = os.getenv("PLANNER_PATH", "content-planer.xlsx")
+# Date-indexed copy of the planner, re-imported when the spreadsheet changes.
+PLANNER_STORE_PATH = os.getenv("PLANNER_STORE_PATH", "data/planner.sqlite3")
+SCHEDULER_CRON = os.getenv("SCHEDULER_CRON", "*/5 * * * *")
+# Publish time for rows without a "publish time" column value.
+SCHEDULER_DEFAULT_PUBLISH_TIME = os.getenv("SCHEDULER_DEFAULT_PUBLISH_TIME", "09:00")
+SCHEDULER_CATCHUP_HORIZON = float(os.getenv("SCHEDULER_CATCHUP_HORIZON", str(24 * 3600)))
+SCHEDULER_STATE_PATH = os.getenv("SCHEDULER_STATE_PATH", "data/scheduler.sqlite3")
+
+# Prometheus /metrics port of the scheduler; worker N listens on METRICS_PORT + 1 + N. 0 disables.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
 
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from scheduling.cron import AsyncCronScheduler, CronExpression, SchedulerState
+
+
+def test_steps_ranges_and_lists():
+    cron = CronExpression("*/15 9-11 * * *")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == {9, 10, 11}
+    assert CronExpression("5,10-12 0 * * *").minutes == {5, 10, 11, 12}
+    assert CronExpression("0 0 * * 1-7/3").weekdays == {1, 4, 0}
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "5-1 * * * *", "* * 0 * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_next_after_is_strictly_after():
+    cron = CronExpression("30 9 * * *")
+    assert cron.next_after(datetime(2025, 3, 4, 9, 29, 59)) == datetime(2025, 3, 4, 9, 30)
+    assert cron.next_after(datetime(2025, 3, 4, 9, 30)) == datetime(2025, 3, 5, 9, 30)
+
+
+def test_day_and_weekday_match_either_when_both_restricted():
+    # 2025-06-01 is a Sunday, 2025-06-02 a Monday.
+    cron = CronExpression("0 0 15 * 1")
+    assert cron.fire_times(datetime(2025, 6, 1), datetime(2025, 6, 16)) == [
+        datetime(2025, 6, 2), datetime(2025, 6, 9), datetime(2025, 6, 15), datetime(2025, 6, 16),
+    ]
+
+
+def test_star_step_counts_as_unrestricted():
+    # "*/2" restricts nothing for the OR rule: only odd days that are Mondays match.
+    cron = CronExpression("0 0 */2 * 1")
+    assert cron.fire_times(datetime(2025, 6, 1), datetime(2025, 6, 30)) == [
+        datetime(2025, 6, 9), datetime(2025, 6, 23),
+    ]
+    # And "*/2" on weekdays only keeps Sun/Tue/Thu/Sat of the restricted days.
+    cron = CronExpression("0 0 1-3 * */2")
+    assert cron.fire_times(datetime(2025, 5, 31), datetime(2025, 6, 3)) == [
+        datetime(2025, 6, 1), datetime(2025, 6, 3),
+    ]
+
+
+def test_month_and_year_rollover():
+    assert CronExpression("0 0 31 * *").next_after(datetime(2025, 4, 1)) == datetime(2025, 5, 31)
+    assert CronExpression("@yearly").next_after(datetime(2025, 12, 31, 23, 59)) == datetime(2026, 1, 1)
+    assert CronExpression("0 12 29 2 *").next_after(datetime(2025, 3, 1)) == datetime(2028, 2, 29, 12)
+
+
+def test_fire_times_window_excludes_start_and_includes_end():
+    cron = CronExpression("*/5 * * * *")
+    start = datetime(2025, 1, 1, 10, 0)
+    assert cron.fire_times(start, start + timedelta(minutes=15)) == [
+        datetime(2025, 1, 1, 10, 5), datetime(2025, 1, 1, 10, 10), datetime(2025, 1, 1, 10, 15),
+    ]
+    assert cron.fire_times(start, start + timedelta(minutes=4)) == []
+
+
+def _run_until_first_fire(scheduler: AsyncCronScheduler, windows: list) -> None:
+    async def main():
+        fired = asyncio.Event()
+
+        async def job(start, end):
+            windows.append((start, end))
+            fired.set()
+
+        task = asyncio.create_task(scheduler._run_job(scheduler.add_job("job", "* * * * *", job)))
+        try:
+            await asyncio.wait_for(fired.wait(), timeout=5)
+        finally:
+            task.cancel()
+
+    asyncio.run(main())
+
+
+def test_catch_up_is_one_window_bounded_by_the_horizon(tmp_path):
+    state = SchedulerState(str(tmp_path / "state.sqlite3"))
+    state.set("job", datetime.now() - timedelta(days=3))
+    scheduler = AsyncCronScheduler(state, catchup_horizon=3600)
+    windows = []
+    before = datetime.now()
+    _run_until_first_fire(scheduler, windows)
+
+    [(start, end)] = windows
+    assert before - timedelta(seconds=3600) <= start <= datetime.now() - timedelta(seconds=3600)
+    # The last missed minute, not the next one.
+    assert datetime.now() - timedelta(minutes=1) < end <= datetime.now()
+    assert state.get("job") == end
+    state.close()
@@ -0,0 +1,38 @@
+import asyncio
+
+from client.embedding_batcher import EmbeddingBatcher
+
+
+def test_concurrent_requests_share_one_call():
+    calls = []
+
+    async def embed(texts):
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    async def main():
+        batcher = EmbeddingBatcher(embed, window=0.01)
+        return await asyncio.gather(
+            batcher.get_embeddings(["a", "bb"]), batcher.get_embeddings(["bb", "ccc"])
+        )
+
+    assert asyncio.run(main()) == [[[1.0], [2.0]], [[2.0], [3.0]]]
+    assert calls == [["a", "bb", "ccc"]]
+
+
+def test_short_provider_response_fails_every_caller():
+    async def embed(texts):
+        return [[1.0] for _ in texts[:-1]]
+
+    async def main():
+        batcher = EmbeddingBatcher(embed, window=0.01)
+        return await asyncio.wait_for(
+            asyncio.gather(
+                batcher.get_embeddings(["a"]), batcher.get_embeddings(["b"]),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
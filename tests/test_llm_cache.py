@@ -0,0 +1,35 @@
+import asyncio
+
+from autanimos_agent.llm_cache import LLMResponseCache
+from benchmarks.fake_wordpress import FakeWordPress
+from benchmarks.servers import ServerThread
+from client.request_data import BaseRequest
+from client.wp_client import WordPressClient
+from domain.wordpress import GeneratePostData
+
+OLD_DATE = "2020-01-01T00:00:00"
+
+
+def test_cache_hit_does_not_backdate_the_published_post(tmp_path):
+    llm_cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    generated = GeneratePostData(
+        title="Title", content="<p>Body</p>", slug="title", date=OLD_DATE, categories=[], tags=[]
+    )
+    key = LLMResponseCache.make_key("model", "openai", "", "prompt", GeneratePostData)
+    llm_cache.put(key, generated, GeneratePostData)
+    cached = llm_cache.get(key, GeneratePostData)
+    assert cached == generated
+
+    wp = FakeWordPress(taxonomy_size=0, latency=0)
+    server = ServerThread(wp.make_app()).start()
+
+    async def main():
+        async with WordPressClient(BaseRequest(), server.url, "user", "password", None) as client:
+            return await client.publish_post(cached, [], [])
+
+    try:
+        published = asyncio.run(main())
+    finally:
+        server.stop()
+        llm_cache.close()
+    assert wp.posts[published.id]["date"] != OLD_DATE
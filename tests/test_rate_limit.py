@@ -0,0 +1,111 @@
+import asyncio
+from email.utils import formatdate
+import time
+
+import pytest
+
+from client.errors import (
+    AuthError,
+    ClientError,
+    HTTPStatusError,
+    NotFoundError,
+    RateLimitError,
+    ServerError,
+    error_for_status,
+    parse_retry_after,
+)
+from client.rate_limit import AdaptiveRateLimiter, backoff_delay, call_with_rate_limit
+
+
+def test_success_raises_the_rate_up_to_the_max():
+    limiter = AdaptiveRateLimiter(1, max_rate=1.25, increase=0.1)
+    limiter.on_success()
+    assert limiter.rate == pytest.approx(1.1)
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.rate == 1.25
+
+
+def test_throttling_halves_the_rate_down_to_the_min():
+    limiter = AdaptiveRateLimiter(8, max_rate=16, min_rate=1.5)
+    limiter.on_throttled()
+    assert limiter.rate == 4
+    for _ in range(5):
+        limiter.on_throttled()
+    assert limiter.rate == 1.5
+
+
+def test_retry_after_blocks_every_caller():
+    limiter = AdaptiveRateLimiter(100, burst=100)
+    assert limiter._reserve() == 0
+    limiter.on_throttled(retry_after=2)
+    assert 1.9 < limiter._reserve() <= 2
+
+
+def test_backoff_delay_is_capped_full_jitter():
+    for attempt in range(10):
+        for _ in range(20):
+            assert 0 <= backoff_delay(attempt, 0.5, 4) <= min(4, 0.5 * 2 ** attempt)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+@pytest.mark.parametrize(
+    "status, cls",
+    [
+        (401, AuthError), (403, AuthError), (404, NotFoundError), (429, RateLimitError),
+        (400, ClientError), (500, ServerError), (503, ServerError), (302, HTTPStatusError),
+    ],
+)
+def test_error_for_status(status, cls):
+    error = error_for_status(status, "http://wp/x", {"code": "some_code"}, {"Retry-After": "1"})
+    assert type(error) is cls
+    assert error.code == "some_code"
+    assert error.retry_after == 1
+
+
+def test_auth_errors_are_client_errors():
+    assert issubclass(AuthError, ClientError)
+    assert not issubclass(ServerError, ClientError)
+
+
+class _ProviderError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+def _call_failing_with(statuses: list[int], max_retries: int = 3) -> tuple[list[int], AdaptiveRateLimiter]:
+    calls = []
+    limiter = AdaptiveRateLimiter(1000, max_rate=1000)
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) <= len(statuses):
+            raise _ProviderError(statuses[len(calls) - 1])
+        return "ok"
+
+    result = asyncio.run(
+        call_with_rate_limit(limiter, call, max_retries=max_retries, base_delay=0.001, max_delay=0.01)
+    )
+    assert result == "ok"
+    return calls, limiter
+
+
+def test_provider_calls_retry_throttling_and_server_errors():
+    calls, limiter = _call_failing_with([429, 500])
+    assert len(calls) == 3
+    assert limiter.rate < 1000
+
+
+def test_provider_calls_do_not_retry_client_errors():
+    with pytest.raises(_ProviderError):
+        _call_failing_with([400])
+    with pytest.raises(_ProviderError):
+        _call_failing_with([500, 500], max_retries=1)
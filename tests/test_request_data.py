@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+from aiohttp import web
+import pytest
+
+from benchmarks.servers import ServerThread
+from client.errors import AuthError, NotFoundError, RateLimitError, ServerError
+from client.request_data import BaseRequest
+
+
+def _serve(*routes: web.RouteDef) -> ServerThread:
+    app = web.Application()
+    app.add_routes(routes)
+    return ServerThread(app).start()
+
+
+async def _ok(request: web.Request) -> web.Response:
+    return web.json_response({"ok": True})
+
+
+def test_new_loop_closes_the_previous_session():
+    server = _serve(web.get("/", _ok))
+    request_data = BaseRequest()
+    try:
+        assert asyncio.run(request_data.aget(server.url + "/")) == {"ok": True}
+        previous = request_data._session
+        assert asyncio.run(request_data.aget(server.url + "/")) == {"ok": True}
+        assert previous.closed
+        assert request_data._session is not previous
+        asyncio.run(request_data.aclose())
+    finally:
+        server.stop()
+
+
+class _Scripted:
+    """Answer each request with the next status of ``statuses``, then with 200."""
+
+    def __init__(self, *statuses: int, retry_after: str | None = None):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.calls = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls += 1
+        if not self.statuses:
+            return web.json_response({"ok": True})
+        headers = {"Retry-After": self.retry_after} if self.retry_after else None
+        return web.json_response({"code": "scripted"}, status=self.statuses.pop(0), headers=headers)
+
+
+def _send(handler: _Scripted, method: str, **kwargs):
+    server = _serve(web.route(method, "/", handler.handle))
+    request_data = BaseRequest(
+        rate_limit=1000, max_rate_limit=1000, retry_base_delay=0.001, retry_max_delay=2
+    )
+
+    async def main():
+        async with request_data:
+            if method == "GET":
+                return await request_data.aget(server.url + "/", **kwargs)
+            return await request_data.apost(server.url + "/", data={}, **kwargs)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.stop()
+
+
+def test_get_is_retried_on_server_errors():
+    handler = _Scripted(500, 503)
+    assert _send(handler, "GET") == {"ok": True}
+    assert handler.calls == 3
+
+
+def test_post_is_not_retried_on_server_errors():
+    handler = _Scripted(500)
+    with pytest.raises(ServerError):
+        _send(handler, "POST")
+    assert handler.calls == 1
+
+
+def test_post_is_retried_on_server_errors_when_marked_safe():
+    handler = _Scripted(502)
+    assert _send(handler, "POST", retry=True) == {"ok": True}
+    assert handler.calls == 2
+
+
+def test_post_is_retried_on_429_after_retry_after():
+    handler = _Scripted(429, retry_after="0.3")
+    start = time.perf_counter()
+    assert _send(handler, "POST") == {"ok": True}
+    assert handler.calls == 2
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_retry_after_longer_than_the_max_delay_fails_at_once():
+    handler = _Scripted(429, retry_after="999")
+    with pytest.raises(RateLimitError) as info:
+        _send(handler, "GET")
+    assert info.value.retry_after == 999
+    assert handler.calls == 1
+
+
+@pytest.mark.parametrize("status, cls", [(401, AuthError), (403, AuthError), (404, NotFoundError)])
+def test_client_errors_are_typed_and_not_retried(status, cls):
+    handler = _Scripted(status)
+    with pytest.raises(cls) as info:
+        _send(handler, "GET")
+    assert info.value.code == "scripted"
+    assert handler.calls == 1
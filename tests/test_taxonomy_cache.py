@@ -0,0 +1,31 @@
+from client.taxonomy_cache import TaxonomyCache
+from domain.wordpress import TagData
+
+
+def test_name_lookup_ignores_case_and_whitespace():
+    cache = TaxonomyCache()
+    tag = cache.add(TagData(id=1, name="Python", slug="python"))
+    assert cache.get_by_name("  pYTHON ") is tag
+    assert cache.get_by_slug("Python") is None
+
+
+def test_renamed_term_drops_its_old_keys():
+    cache = TaxonomyCache()
+    cache.add(TagData(id=1, name="Python", slug="python"))
+    renamed = cache.add(TagData(id=1, name="Python 3", slug="python-3"))
+    assert cache.get_by_name("Python") is None
+    assert cache.get_by_slug("python") is None
+    assert cache.get_by_name("python 3") is renamed
+    assert cache.get_by_slug("python-3") is renamed
+    assert cache.all() == [renamed]
+
+
+def test_merge_rename_keeps_keys_owned_by_other_terms():
+    cache = TaxonomyCache()
+    cache.add(TagData(id=1, name="AI", slug="ai"))
+    other = cache.add(TagData(id=2, name="ai", slug="ai-2"))
+    merged = cache.merge(TagData, {"id": 1, "name": "Machine Learning"})
+    assert merged.slug == "ai"
+    assert cache.get_by_name("AI") is other
+    assert cache.get_by_name("machine learning") is merged
+    assert cache.get_by_slug("ai") is merged
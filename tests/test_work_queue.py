@@ -0,0 +1,42 @@
+import time
+
+from scheduling.work_queue import STATUS_DONE, STATUS_LEASED, STATUS_QUEUED, WorkQueue
+
+
+def _expire(queue: WorkQueue, item_id: int) -> None:
+    with queue._lock:
+        queue._conn.execute(
+            "UPDATE queue SET lease_expires_at = ? WHERE id = ?", (time.time() - 1, item_id)
+        )
+
+
+def _status(queue: WorkQueue, item_id: int) -> tuple[str, str | None]:
+    with queue._lock:
+        return queue._conn.execute(
+            "SELECT status, lease_owner FROM queue WHERE id = ?", (item_id,)
+        ).fetchone()
+
+
+def test_ack_by_owner(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue("job", {"title": "a"})
+    item = queue.lease("worker-a", 60)
+
+    assert queue.ack(item.id, "worker-a")
+    assert _status(queue, item.id) == (STATUS_DONE, None)
+
+
+def test_stale_owner_cannot_ack_or_nack(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue("job", {"title": "a"})
+    stale = queue.lease("worker-a", 60)
+    _expire(queue, stale.id)
+    current = queue.lease("worker-b", 60)
+    assert current.id == stale.id
+
+    assert not queue.ack(stale.id, "worker-a")
+    assert not queue.nack(stale.id, "worker-a", "boom", 0)
+    assert _status(queue, stale.id) == (STATUS_LEASED, "worker-b")
+
+    assert queue.nack(current.id, "worker-b", "boom", 0)
+    assert _status(queue, current.id) == (STATUS_QUEUED, None)